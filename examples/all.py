@@ -1,2 +1,2 @@
-from examples import annotation, explicit_responses, files, middlewares, param_sources, routers, validation, main  # noqa
+from examples import annotation, caching, explicit_responses, files, limits, live, middlewares, param_sources, routers, validation, main  # noqa
 from examples.main import app  # noqa
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+from examples.main import app
+from liteapi import Router
+from liteapi.caching import SharedMemoryCache
+
+shared_cache = SharedMemoryCache(os.path.join(tempfile.gettempdir(), 'liteapi-example.cache'))
+cached_router = Router('/cached', cache=shared_cache)
+
+
+@cached_router.get('/rates/{currency}', cache_ttl=30)
+def exchange_rates(currency: str):
+    return {'currency': currency, 'rates': {'EUR': 0.92, 'GBP': 0.79}}
+
+
+@app.get('/cache')
+def cache_stats():
+    return shared_cache.stats()
+
+
+app.add_router(cached_router)
@@ -1,6 +1,6 @@
 from examples.main import app
 from liteapi import Router
-from liteapi.responses import HTMLResponse, JSONResponse, PlainResponse
+from liteapi.responses import HTMLResponse, JSONResponse, PlainResponse, StreamingJSONResponse
 
 implicit = Router('/implicit')
 explicit = Router('/explicit')
@@ -21,6 +21,11 @@ def hello_text():
     return 'hello in plaintext'
 
 
+@implicit.get('/numbers', content_type='application/json')
+def numbers(count: int = 1000):
+    return ({'n': n} for n in range(count))
+
+
 @explicit.get('/hello1')
 def hello_html():
     return HTMLResponse('<h1>hello in HTML</h1>')
@@ -36,5 +41,14 @@ def hello_text():
     return PlainResponse('hello in plaintext', 202)
 
 
+@explicit.get('/numbers')
+async def numbers(count: int = 1000):
+    async def generate():
+        for n in range(count):
+            yield {'n': n}
+
+    return StreamingJSONResponse(generate(), batch_size=250)
+
+
 app.add_router(implicit)
 app.add_router(explicit)
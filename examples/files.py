@@ -2,27 +2,34 @@ import os
 
 from examples.main import app
 from liteapi import Router
+from liteapi.background import BackgroundTasks
 
 image_router = Router('/images')
 
 
+def save_file(path: str, content: bytes):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
 @image_router.post('/upload', content_type='text/plain')
 async def files_and_form_data(
         filename1: str,
         filename2: str,
         file1: bytes,
-        file2: bytes
+        file2: bytes,
+        tasks: BackgroundTasks
 ):
     os.makedirs('downloaded', exist_ok=True)
 
-    if file1:
-        with open(f'downloaded/{filename1}.png', 'wb') as f1:
-            f1.write(file1)
-    if file2:
-        with open(f'downloaded/{filename2}.png', 'wb') as f2:
-            f2.write(file2)
+    saved = []
+    for filename, file in [(filename1, file1), (filename2, file2)]:
+        if file:
+            path = f'downloaded/{filename}.png'
+            tasks.add_task(save_file, path, file)
+            saved.append(path)
 
-    return f'saved files: {[f1.name, f2.name]}'
+    return f'saving files: {saved}'
 
 
 @image_router.get('/download', content_type='image/png')
@@ -0,0 +1,21 @@
+import asyncio
+
+from examples.main import app
+from liteapi import Router
+from liteapi.limits import ConcurrencyLimit
+
+heavy_router = Router('/heavy', limit=ConcurrencyLimit(8, max_queue=16, queue_timeout=2))
+
+
+@heavy_router.get('/report', limit=ConcurrencyLimit(2, max_queue=4, queue_timeout=1, retry_after=5))
+async def build_report():
+    await asyncio.sleep(0.5)
+    return {'report': 'done'}
+
+
+@app.get('/limits')
+def concurrency_stats():
+    return app.concurrency_stats()
+
+
+app.add_router(heavy_router)
@@ -0,0 +1,15 @@
+from examples.main import app
+from liteapi import Router
+from liteapi.websockets import WebSocket
+
+live_router = Router('/live')
+
+
+@live_router.websocket('/rooms/{room_id}', idle_timeout=60, ping_interval=20)
+async def room_feed(socket: WebSocket, room_id: int, nickname: str = 'guest'):
+    await socket.send_json({'joined': room_id, 'nickname': nickname})
+    async for message in socket.iter_messages():
+        await socket.send_json({'room': room_id, 'from': nickname, 'text': message})
+
+
+app.add_router(live_router)
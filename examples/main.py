@@ -6,3 +6,6 @@ app = App()
 @app.get('/ping')
 def ping():
     return 'pong'
+
+
+app.enable_batch('/batch', max_concurrency=8)
@@ -1,6 +1,9 @@
+from time import perf_counter
+
 from examples.main import app
 from liteapi import Router
-from liteapi.middleware import PostMiddleware, PreMiddleware
+from liteapi.cors import CORSPolicy
+from liteapi.middleware import PreMiddleware
 from liteapi.requests import Request
 from liteapi.responses import PlainResponse
 
@@ -11,10 +14,24 @@ class PathLogger(PreMiddleware):
         return request
 
 
-class AddCORS(PostMiddleware):
-    async def postprocess(self, response):
-        response.add_header('Access-Control-Allow-Origin', '*')
-        return response
+class ServerTiming:
+    def __init__(self, app, header: bytes = b'server-timing'):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        start = perf_counter()
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                timing = f'app;dur={(perf_counter() - start) * 1000:.2f}'.encode()
+                message = {**message, 'headers': [*message['headers'], (self.header, timing)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
 
 
 class MagicGuard(PreMiddleware):
@@ -28,12 +45,12 @@ class MagicGuard(PreMiddleware):
 
 
 log_path = PathLogger()
-cors = AddCORS()
+cors = CORSPolicy(['https://example.com', 'https://*.example.com'], allow_headers=['content-type'], max_age=3600)
 guard = MagicGuard('123')
 
-logged_router = Router('/logged')
+logged_router = Router('/logged', cors=cors)
 logged_router.add_middleware(log_path)
-app.add_middleware(cors)
+app.add_asgi_middleware(ServerTiming, path='/logged')
 
 
 @logged_router.get('/{pos_input}')
@@ -45,3 +62,6 @@ def cors_and_logged(pos_input: str):
 @app.get('/magic')
 def enter_with_magic():
     return 'Passage granted'
+
+
+app.add_router(logged_router)
@@ -0,0 +1,66 @@
+import json
+import random
+import sys
+import time
+from contextlib import nullcontext
+from typing import TextIO
+
+from liteapi.buffering import BufferedWriter
+from liteapi.requests import RequestScope
+
+
+class AccessLog(BufferedWriter):
+    thread_name = 'liteapi-access-log'
+
+    def __init__(
+            self,
+            path: str = None,
+            *,
+            stream: TextIO = None,
+            buffer_size: int = 10000,
+            batch_size: int = 500,
+            flush_interval: float = 1.0,
+            sample_rate: float = 1.0,
+            always_log_errors: bool = True
+    ):
+        super().__init__(buffer_size=buffer_size, flush_interval=flush_interval)
+        self._path = path
+        self._stream = stream
+        self._batch_size = batch_size
+        self._sample_rate = sample_rate
+        self._always_log_errors = always_log_errors
+        self._written = 0
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    def record(self, scope: RequestScope, status: int, sent: int, latency: float):
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            if not (self._always_log_errors and status >= 500):
+                return
+
+        self._put({
+            'ts': time.time(),
+            'method': scope.method,
+            'route': scope.route,
+            'path': scope.path,
+            'status': status,
+            'bytes': sent,
+            'latency_ms': round(latency * 1000, 3),
+        })
+
+    def _open(self):
+        if self._path:
+            return open(self._path, 'a', encoding='utf-8')
+        return nullcontext(self._stream or sys.stdout)
+
+    def _flush(self, output: TextIO):
+        while self._buffer:
+            lines = []
+            while self._buffer and len(lines) < self._batch_size:
+                lines.append(json.dumps(self._buffer.popleft()))
+
+            output.write('\n'.join(lines) + '\n')
+            output.flush()
+            self._written += len(lines)
@@ -1,11 +1,29 @@
-from typing import Callable, Dict
+import math
+from time import perf_counter
+from typing import Callable, Dict, Any, List, Optional, Tuple, Mapping, Awaitable
 
+from liteapi.access_log import AccessLog
+from liteapi.background import BackgroundRunner
+from liteapi.batch import BatchProcessor
+from liteapi.caching import ResponseCache, MemoryCache
+from liteapi.capture import TrafficRecorder
+from liteapi.cors import CORSPolicy
+from liteapi.deadlines import Deadline
 from liteapi.endpoint import Endpoint
+from liteapi.limits import ConcurrencyLimit
 from liteapi.openapi import OpenAPI
-from liteapi.parsing import RequestParser, EndpointProcessor
+from liteapi.profiling import Profiler, profiler_router
+from liteapi.parsing import match_endpoint, extract_sources, extract_websocket_sources, read_body, execute, \
+    execute_websocket
 from liteapi.requests import RequestScope, Request
-from liteapi.responses import ResponseDispatcher, Response
-from liteapi.routing import RoutingMixin, Router
+from liteapi.responses import Response, send_response
+from liteapi.routing import RoutingMixin, Router, in_scope
+from liteapi.websockets import WebSocket, WebSocketOptions
+
+ASGIApp = Callable[[dict, Callable, Callable], Awaitable[None]]
+
+_no_limits: List[ConcurrencyLimit] = []
+_MATCH_KEY = 'liteapi.match'
 
 
 class App(RoutingMixin):
@@ -13,7 +31,16 @@ class App(RoutingMixin):
             self,
             title='Application',
             doc_path='/api',
-            doc_json_path='/api_json'
+            doc_json_path='/api_json',
+            *,
+            limit: ConcurrencyLimit = None,
+            timeout: float = None,
+            deadline_header: str = None,
+            background_concurrency: int = 16,
+            access_log: AccessLog = None,
+            cache: ResponseCache = None,
+            cors: CORSPolicy = None,
+            recorder: TrafficRecorder = None
     ):
         super().__init__()
 
@@ -21,6 +48,18 @@ class App(RoutingMixin):
         self._title = title
         self._doc_path = doc_path
         self._doc_json_path = doc_json_path
+        self._global_limit = limit
+        self._timeout = timeout
+        self._deadline_header = deadline_header.lower() if deadline_header else None
+        self._background = BackgroundRunner(background_concurrency)
+        self._batch: Optional[BatchProcessor] = None
+        self._profiler: Optional[Profiler] = None
+        self._access_log = access_log
+        self._cache = cache if cache is not None else MemoryCache()
+        self._cors = cors
+        self._recorder = recorder
+        self._asgi_middlewares: List[Tuple[Callable[..., ASGIApp], Optional[str], Dict[str, Any]]] = []
+        self._asgi_chains: Optional[Dict[Optional[str], ASGIApp]] = None
 
         self._setup_openapi()
 
@@ -34,6 +73,25 @@ class App(RoutingMixin):
         self.get(self._doc_path, content_type='text/html')(openapi.doc_endpoint)
         self.get(self._doc_json_path, content_type='application/json')(openapi.doc_json_endpoint)
 
+    def enable_batch(self, path: str = '/batch', *, max_concurrency: int = 8, max_items: int = 100):
+        self._batch = BatchProcessor(self._process_request, path, max_concurrency, max_items)
+
+    def enable_profiling(
+            self,
+            path: str = '/_profiler',
+            *,
+            token: str,
+            output_dir: str = 'profiles',
+            trigger_header: str = None
+    ) -> Profiler:
+        self._profiler = Profiler(self._endpoints, output_dir, trigger_header, token)
+        self.add_router(profiler_router(self._profiler, path))
+        return self._profiler
+
+    def add_asgi_middleware(self, middleware: Callable[..., ASGIApp], *, path: str = None, **options):
+        self._asgi_middlewares.append((middleware, path, options))
+        self._asgi_chains = None
+
     def add_router(self, router: Router, *, prefix: str = ''):
         if prefix:
             router.prefix = prefix
@@ -42,17 +100,225 @@ class App(RoutingMixin):
         for route, endpoints in router.endpoints.items():
             for endpoint in endpoints.values():
                 endpoint.tags = router.tags
+                endpoint.route = router.prefix + route
+                if endpoint.cache_ttl and endpoint.cache is None:
+                    endpoint.cache = self._cache
+                if endpoint.cors is None:
+                    endpoint.cors = self._cors
+            for middleware, path in self._middlewares:
+                if in_scope(router.prefix + route, path):
+                    for method, endpoint in endpoints.items():
+                        endpoints[method] = middleware(endpoint)
             new_endpoints[router.prefix + route] = endpoints
 
         self._endpoints.update(new_endpoints)
+        self._asgi_chains = None
+
+    def _add_endpoint(self, path: str, endpoint: Endpoint, limit: ConcurrencyLimit = None) -> Endpoint:
+        self._asgi_chains = None
+        return super()._add_endpoint(path, endpoint, limit)
 
     async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if self._recorder is not None and scope['type'] == 'http':
+            await self._recorder.record(scope, receive, send, self._serve)
+        else:
+            await self._serve(scope, receive, send)
+
+    async def _serve(self, scope: dict, receive: Callable, send: Callable):
+        if self._asgi_middlewares:
+            await self._asgi_chain(scope)(scope, receive, send)
+        else:
+            await self._handle(scope, receive, send)
+
+    def _asgi_chain(self, scope: dict) -> ASGIApp:
+        if self._asgi_chains is None:
+            self._asgi_chains = self._compile_asgi_chains()
+        if scope['type'] == 'lifespan':
+            return self._asgi_chains[None]
+
+        path = scope['path']
+        method = 'WEBSOCKET' if scope['type'] == 'websocket' else scope['method']
+        endpoint, path_args = match_endpoint(self._endpoints, path, method)
+        scope[_MATCH_KEY] = (path, method, endpoint, path_args)
+        return self._asgi_chains.get(endpoint.route, self._asgi_chains[None])
+
+    def _compile_asgi_chains(self) -> Dict[Optional[str], ASGIApp]:
+        compiled: Dict[Tuple[int, ...], ASGIApp] = {}
+
+        def chain_for(route: Optional[str]) -> ASGIApp:
+            applicable = tuple(
+                index
+                for index, (_, path, _) in enumerate(self._asgi_middlewares)
+                if in_scope(route, path)
+            )
+            if applicable not in compiled:
+                app = self._handle
+                for index in reversed(applicable):
+                    middleware, _, options = self._asgi_middlewares[index]
+                    app = middleware(app, **options)
+                compiled[applicable] = app
+            return compiled[applicable]
+
+        chains = {route: chain_for(route) for route in self._endpoints}
+        chains[None] = chain_for(None)
+        return chains
+
+    def _match(self, scope: RequestScope) -> Tuple[Endpoint, Mapping[str, Any]]:
+        match = scope.extra.get(_MATCH_KEY)
+        if match is not None and match[0] == scope.path and match[1] == scope.method:
+            return match[2], match[3]
+        return match_endpoint(self._endpoints, scope.path, scope.method)
+
+    async def _handle(self, scope: dict, receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] == 'websocket':
+            await self._process_websocket(RequestScope(**scope, method='WEBSOCKET'), receive, send)
+            return
+
+        start = perf_counter()
         scope = RequestScope(**scope)
-        response = await self._process_request(scope, receive)
-        await ResponseDispatcher(response, send).send()
+        status, sent = 500, 0
+        try:
+            response = await self._process_request(scope, receive)
+            sent = await send_response(response, send, head=scope.method == 'HEAD')
+            status = response.status_code
+        finally:
+            if self._access_log is not None:
+                self._access_log.record(scope, status, sent, perf_counter() - start)
+        if response.background:
+            self._background.schedule(response.background)
+
+    async def _lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self._background.drain()
+                if self._access_log is not None:
+                    self._access_log.close()
+                if self._recorder is not None:
+                    self._recorder.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
 
     async def _process_request(self, scope: RequestScope, receive: Callable) -> Response:
-        parser = RequestParser(self._endpoints, scope, receive)
-        args, endpoint = await parser.extract_args_and_endpoint()
-        processor = EndpointProcessor(endpoint, Request(scope, args))
-        return await processor.execute()
+        if self._batch is not None and scope.path == self._batch.path and scope.method == 'POST':
+            return await self._batch.process(scope, await read_body(receive))
+
+        if scope.method == 'OPTIONS':
+            preflight = self._preflight(scope)
+            if preflight is not None:
+                return preflight
+
+        endpoint, path_args = self._match(scope)
+        scope.route = endpoint.route
+        response = await self._dispatch(endpoint, path_args, scope, receive)
+        if endpoint.cors is not None:
+            origin = scope.headers.get('origin')
+            if origin is not None:
+                endpoint.cors.apply(response, origin)
+        return response
+
+    def _preflight(self, scope: RequestScope) -> Optional[Response]:
+        requested_method = scope.headers.get('access-control-request-method')
+        if requested_method is None:
+            return None
+
+        endpoint, _ = match_endpoint(self._endpoints, scope.path, requested_method.upper())
+        if endpoint.cors is None:
+            return None
+        scope.route = endpoint.route
+        return endpoint.cors.preflight(scope.headers)
+
+    async def _dispatch(self, endpoint: Endpoint, path_args: Mapping[str, Any], scope: RequestScope,
+                        receive: Callable) -> Response:
+        deadline = Deadline.from_budgets(
+            endpoint.timeout if endpoint.timeout is not None else self._timeout,
+            self._header_budget(scope)
+        )
+
+        acquired, rejected = await self._acquire_limits(endpoint)
+        try:
+            if rejected is not None:
+                return rejected.overloaded_response()
+
+            sources = await extract_sources(scope, receive, path_args)
+            request = Request(scope, None, deadline, receive)
+            if self._profiler is not None and self._profiler.trigger_header:
+                request.profile = self._profiler.triggered(request)
+            return await execute(endpoint, request, sources)
+        finally:
+            self._release_limits(acquired)
+
+    async def _process_websocket(self, scope: RequestScope, receive: Callable, send: Callable):
+        endpoint, path_args = self._match(scope)
+        socket = WebSocket(receive, send, endpoint.websocket or WebSocketOptions())
+        if endpoint.websocket is None:
+            await socket.close(1000)
+            return
+
+        acquired, rejected = await self._acquire_limits(endpoint)
+        try:
+            if rejected is not None:
+                await socket.close(1013)
+                return
+
+            request = Request(scope, None)
+            request.websocket = socket
+            await execute_websocket(endpoint, request, extract_websocket_sources(scope, path_args))
+        finally:
+            self._release_limits(acquired)
+
+    async def _acquire_limits(self, endpoint: Endpoint) \
+            -> Tuple[List[ConcurrencyLimit], Optional[ConcurrencyLimit]]:
+        limits = endpoint.limits
+        if self._global_limit is not None:
+            limits = [*limits, self._global_limit]
+        if not limits:
+            return _no_limits, None
+
+        acquired = []
+        try:
+            for limit in limits:
+                if not await limit.acquire():
+                    return acquired, limit
+                acquired.append(limit)
+        except BaseException:
+            self._release_limits(acquired)
+            raise
+        return acquired, None
+
+    @staticmethod
+    def _release_limits(acquired: List[ConcurrencyLimit]):
+        for limit in reversed(acquired):
+            limit.release()
+
+    def _header_budget(self, scope: RequestScope) -> Optional[float]:
+        if self._deadline_header is None:
+            return None
+
+        value = scope.headers.get(self._deadline_header)
+        try:
+            budget = float(value)
+        except (TypeError, ValueError):
+            return None
+        if not math.isfinite(budget):
+            return None
+        return max(budget, 0.0) / 1000
+
+    def route_for(self, method: str, path: str) -> Optional[str]:
+        return match_endpoint(self._endpoints, path, method.upper())[0].route
+
+    def concurrency_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        stats = {}
+        if self._global_limit is not None:
+            stats['*'] = [self._global_limit.stats()]
+        for path, endpoints in self._endpoints.items():
+            for method, endpoint in endpoints.items():
+                for limit in endpoint.limits:
+                    stats.setdefault(f'{method} {path}', []).append(limit.stats())
+        return stats
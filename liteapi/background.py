@@ -0,0 +1,58 @@
+import asyncio
+import inspect
+import logging
+from typing import Callable, List, Tuple, Set, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    def __init__(self):
+        self._tasks: List[Tuple[Callable, tuple, dict]] = []
+
+    def add_task(self, func: Callable, *args, **kwargs):
+        self._tasks.append((func, args, kwargs))
+
+    def extend(self, other: 'BackgroundTasks'):
+        if other is not self:
+            self._tasks.extend(other._tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+
+class BackgroundRunner:
+    def __init__(self, max_concurrency: int = 16):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._running: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._running)
+
+    def schedule(self, tasks: BackgroundTasks):
+        for func, args, kwargs in tasks:
+            task = asyncio.ensure_future(self._run(func, args, kwargs))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def drain(self, timeout: Optional[float] = None):
+        if not self._running:
+            return
+
+        _, pending = await asyncio.wait(set(self._running), timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+    async def _run(self, func: Callable, args: tuple, kwargs: dict):
+        async with self._semaphore:
+            try:
+                if inspect.iscoroutinefunction(func):
+                    await func(*args, **kwargs)
+                else:
+                    await asyncio.to_thread(func, *args, **kwargs)
+            except Exception:  # noqa
+                logger.exception('Background task %r failed', func)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, Any, Tuple
+
+from liteapi.background import BackgroundTasks
+from liteapi.negotiation import MSGPACK_TYPES, unpack
+from liteapi.requests import RequestScope
+from liteapi.responses import Response, JSONResponse, MsgPackResponse, negotiate, collect_body
+
+logger = logging.getLogger(__name__)
+
+_DROPPED_HEADERS = {b'content-type', b'content-length', b'accept'}
+
+
+class BatchProcessor:
+    def __init__(
+            self,
+            process_request: Callable,
+            path: str,
+            max_concurrency: int = 8,
+            max_items: int = 100
+    ):
+        self._process_request = process_request
+        self.path = path
+        self._max_concurrency = max_concurrency
+        self._max_items = max_items
+
+    async def process(self, scope: RequestScope, body: bytes) -> Response:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            items = None
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return JSONResponse({'message': 'Batch body must be a JSON list of objects'}, 400)
+        if len(items) > self._max_items:
+            return JSONResponse({'message': f'Batch is limited to {self._max_items} items'}, 413)
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        background = BackgroundTasks()
+
+        async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._process_item(scope, item, background)
+
+        results = await asyncio.gather(*[run(item) for item in items])
+        response = JSONResponse(results, background=background if background else None)
+        return negotiate(response, scope.headers.get('accept'))
+
+    async def _process_item(self, scope: RequestScope, item: Dict[str, Any], background: BackgroundTasks) \
+            -> Dict[str, Any]:
+        path = item.get('path')
+        if not isinstance(path, str) or path == self.path:
+            return self._result(400, {'message': 'Invalid batch item path'})
+        if not isinstance(item.get('method', 'GET'), str):
+            return self._result(400, {'message': 'Invalid batch item method'})
+        if not isinstance(item.get('query') or '', (str, dict)):
+            return self._result(400, {'message': 'Invalid batch item query'})
+
+        try:
+            item_scope, body = self._item_scope(scope, item)
+            response = await self._process_request(item_scope, self._receiver(body))
+            item_body = await self._item_body(response)
+        except Exception:  # noqa
+            logger.exception('Batch item %s %s failed', item.get('method', 'GET'), path)
+            return self._result(500, {'message': 'Internal server error'})
+
+        if response.background:
+            background.extend(response.background)
+
+        return self._result(
+            response.status_code,
+            item_body,
+            {key.decode(): value.decode() for key, value in response.headers}
+        )
+
+    @staticmethod
+    def _item_scope(scope: RequestScope, item: Dict[str, Any]) -> Tuple[RequestScope, bytes]:
+        headers = [
+            (key, value)
+            for key, value
+            in scope.raw_headers
+            if key.lower() not in _DROPPED_HEADERS
+        ]
+
+        body = b''
+        if item.get('body') is not None:
+            body = json.dumps(item['body']).encode()
+            headers.append((b'content-type', b'application/json'))
+
+        query = item.get('query') or ''
+        if isinstance(query, dict):
+            query = '&'.join(f'{key}={value}' for key, value in query.items())
+
+        path = item['path']
+        item_scope = RequestScope(
+            type=scope.type,
+            asgi=scope.asgi,
+            http_version=scope.http_version,
+            server=scope.server,
+            client=scope.client,
+            scheme=scope.scheme,
+            method=item.get('method', 'GET').upper(),
+            root_path=scope.root_path,
+            path=path,
+            raw_path=path.encode(),
+            query_string=query.encode(),
+            headers=headers,
+            state=scope.state,
+        )
+        return item_scope, body
+
+    @staticmethod
+    def _receiver(body: bytes) -> Callable:
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        return receive
+
+    @staticmethod
+    async def _item_body(response: Response) -> Any:
+        if isinstance(response, (JSONResponse, MsgPackResponse)):
+            return response.data
+
+        body = await collect_body(response)
+        content_type = (response.content_type or '').split(';')[0].strip()
+        try:
+            if content_type == 'application/json':
+                return json.loads(body)
+            if content_type in MSGPACK_TYPES:
+                return unpack(body)
+        except ValueError:
+            pass
+        return body.decode(errors='replace')
+
+    @staticmethod
+    def _result(status: int, body: Any, headers: Dict[str, str] = None) -> Dict[str, Any]:
+        return {
+            'status': status,
+            'headers': headers or {},
+            'body': body,
+        }
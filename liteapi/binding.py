@@ -0,0 +1,105 @@
+import collections.abc
+import inspect
+from inspect import isclass
+from typing import Any, Mapping, Union, get_origin, get_args, Tuple, Dict
+
+from pydantic import BaseModel
+
+from liteapi.background import BackgroundTasks
+from liteapi.deadlines import Deadline
+from liteapi.errors import ConversionError, MissingRequiredError, UnsupportedMediaTypeError
+from liteapi.negotiation import NDJSON_TYPES
+from liteapi.streaming import NDJSONStream, DEFAULT_MAX_LINE_SIZE
+from liteapi.websockets import WebSocket
+
+INJECTED = (Deadline, BackgroundTasks, WebSocket)
+
+_VALUE, _MODEL, _DEADLINE, _BACKGROUND, _WEBSOCKET, _STREAM = range(6)
+_stream_origins = (collections.abc.AsyncIterator, collections.abc.AsyncIterable)
+_injected_kinds = {
+    Deadline: _DEADLINE,
+    BackgroundTasks: _BACKGROUND,
+    WebSocket: _WEBSOCKET,
+}
+
+
+class Binding:
+    __slots__ = ('name', 'cls', 'kind', 'optional', 'default', 'max_line_size')
+
+    def __init__(self, param: inspect.Parameter, max_line_size: int = DEFAULT_MAX_LINE_SIZE):
+        self.name = param.name
+        self.optional = is_optional(param)
+        self.cls = extract_from_optional(param) if self.optional else param.annotation
+        self.default = param.default
+        self.max_line_size = max_line_size
+
+        if self.cls in _injected_kinds:
+            self.kind = _injected_kinds[self.cls]
+        elif is_body_stream(self.cls):
+            self.kind = _STREAM
+        elif isclass(self.cls) and issubclass(self.cls, BaseModel):
+            self.kind = _MODEL
+        else:
+            self.kind = _VALUE
+
+    def bind(self, request, sources: Mapping[str, Any]) -> Any:
+        kind = self.kind
+        if kind == _VALUE:
+            try:
+                return self.cls(sources[self.name])
+            except ValueError:
+                raise ConversionError(self.name, self.cls.__name__, sources[self.name])
+            except KeyError:
+                return self._missing()
+        elif kind == _MODEL:
+            try:
+                return self.cls(**sources)
+            except ValueError:
+                raise ConversionError(self.name, self.cls.__name__, sources.get(self.name))
+            except KeyError:
+                return self._missing()
+        elif kind == _DEADLINE:
+            return request.deadline
+        elif kind == _BACKGROUND:
+            request.background = BackgroundTasks()
+            return request.background
+        elif kind == _STREAM:
+            content_type = request.scope.headers.get('content-type', '').split(';')[0].strip()
+            if content_type not in NDJSON_TYPES:
+                raise UnsupportedMediaTypeError(self.name, content_type, NDJSON_TYPES[0])
+            item_type = get_args(self.cls)[0] if get_args(self.cls) else None
+            return NDJSONStream(request.receive, item_type, self.max_line_size)
+        else:
+            return request.websocket
+
+    def _missing(self) -> Any:
+        if self.optional:
+            return None
+        elif self.default is inspect.Parameter.empty:
+            raise MissingRequiredError(self.name, self.cls.__name__)
+        return self.default
+
+
+def compile_bindings(signature: inspect.Signature, max_line_size: int = DEFAULT_MAX_LINE_SIZE) \
+        -> Tuple[Binding, ...]:
+    return tuple(Binding(param, max_line_size) for param in signature.parameters.values())
+
+
+def bind_args(bindings: Tuple[Binding, ...], request, sources: Mapping[str, Any]) -> Dict[str, Any]:
+    return {binding.name: binding.bind(request, sources) for binding in bindings}
+
+
+def is_optional(param: inspect.Parameter):
+    return get_origin(param.annotation) is Union and type(None) in get_args(param.annotation)
+
+
+def extract_from_optional(param: inspect.Parameter):
+    return get_args(param.annotation)[0]
+
+
+def is_injected(cls) -> bool:
+    return cls in INJECTED
+
+
+def is_body_stream(cls) -> bool:
+    return get_origin(cls) in _stream_origins
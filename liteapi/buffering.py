@@ -0,0 +1,68 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, ContextManager, Deque, Optional
+
+
+class BufferedWriter(ABC):
+    """Queues items on the event loop and hands them to a daemon thread that writes them every
+    ``flush_interval`` seconds. Items arriving while ``buffer_size`` items are pending are dropped.
+    """
+
+    thread_name = 'liteapi-writer'
+
+    def __init__(self, *, buffer_size: int = 10000, flush_interval: float = 1.0):
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+
+        self._buffer: Deque[Any] = deque()
+        self._dropped = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _put(self, item: Any):
+        if len(self._buffer) >= self._buffer_size:
+            self._dropped += 1
+            return
+
+        self._buffer.append(item)
+        if self._thread is None:
+            self.start()
+
+    def _run(self):
+        with self._open() as output:
+            while not self._stop.wait(self._flush_interval):
+                self._flush(output)
+            self._flush(output)
+
+    @abstractmethod
+    def _open(self) -> ContextManager:
+        pass
+
+    @abstractmethod
+    def _flush(self, output):
+        pass
@@ -0,0 +1,206 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional, Dict, Any, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: bytes, value: bytes, ttl: float) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: bytes):
+        pass
+
+
+class MemoryCache(ResponseCache):
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, Tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: bytes, value: bytes, ttl: float) -> bool:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def delete(self, key: bytes):
+        self._entries.pop(key, None)
+
+
+_MAGIC = b'LTCACHE1'
+_HEADER = struct.Struct('<8sII')
+_SLOT = struct.Struct('<I16sdBI')
+_SEQ = struct.Struct('<I')
+_REF_OFFSET = 28
+
+
+class SharedMemoryCache(ResponseCache):
+    """Response cache in a memory-mapped file shared by every process that opens the same path.
+
+    The file holds ``slots`` fixed-size slots. A key hashes to a set of ``ways`` neighbouring slots, and
+    eviction inside that set follows the clock algorithm. Each slot is guarded by a sequence counter: readers
+    take no lock and treat a torn read as a miss, while writers serialize on an exclusive ``lockf`` lock. That
+    lock is owned per process, so it also excludes workers forked after the cache was created.
+    """
+
+    def __init__(self, path: str, *, slots: int = 1024, slot_size: int = 16384, ways: int = 8):
+        if slot_size <= _SLOT.size:
+            raise ValueError(f'slot_size must be larger than {_SLOT.size} bytes')
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._map = self._attach(slots, slot_size)
+        self.slots, self.slot_size = _HEADER.unpack_from(self._map)[1:]
+        self.ways = min(ways, self.slots)
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_value_size(self) -> int:
+        return self.slot_size - _SLOT.size
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        digest = _digest(key)
+        for offset in self._probe(digest):
+            seq, slot_digest, expires, _, length = _SLOT.unpack_from(self._map, offset)
+            if slot_digest != digest or seq & 1:
+                continue
+
+            start = offset + _SLOT.size
+            value = self._map[start:start + length]
+            if _SEQ.unpack_from(self._map, offset)[0] != seq or expires <= time.time():
+                break
+
+            self._map[offset + _REF_OFFSET] = 1
+            self._hits += 1
+            return value
+
+        self._misses += 1
+        return None
+
+    def set(self, key: bytes, value: bytes, ttl: float) -> bool:
+        if len(value) > self.max_value_size:
+            return False
+
+        digest = _digest(key)
+        with self._locked():
+            offset = self._victim(digest)
+            seq = _SEQ.unpack_from(self._map, offset)[0]
+            _SEQ.pack_into(self._map, offset, seq + 1)
+
+            start = offset + _SLOT.size
+            self._map[start:start + len(value)] = value
+            _SLOT.pack_into(self._map, offset, seq + 1, digest, time.time() + ttl, 1, len(value))
+            _SEQ.pack_into(self._map, offset, seq + 2)
+        return True
+
+    def delete(self, key: bytes):
+        digest = _digest(key)
+        with self._locked():
+            for offset in self._probe(digest):
+                seq, slot_digest = _SLOT.unpack_from(self._map, offset)[:2]
+                if slot_digest == digest:
+                    _SLOT.pack_into(self._map, offset, seq + 2, bytes(16), 0.0, 0, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+        }
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    def _attach(self, slots: int, slot_size: int) -> mmap.mmap:
+        with self._locked():
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                size = _HEADER.size + slots * slot_size
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots, slot_size), 0)
+
+            mapped = mmap.mmap(self._fd, size)
+            if _HEADER.unpack_from(mapped)[0] != _MAGIC:
+                mapped.close()
+                raise ValueError(f'{self.path} is not a response cache file')
+            return mapped
+
+    def _probe(self, digest: bytes):
+        first = int.from_bytes(digest[:8], 'little') % self.slots
+        for way in range(self.ways):
+            yield _HEADER.size + (first + way) % self.slots * self.slot_size
+
+    def _victim(self, digest: bytes) -> int:
+        now = time.time()
+        candidates = list(self._probe(digest))
+        for offset in candidates:
+            slot_digest, expires = _SLOT.unpack_from(self._map, offset)[1:3]
+            if slot_digest == digest or expires <= now:
+                return offset
+
+        self._evictions += 1
+        while True:
+            for offset in candidates:
+                if not self._map[offset + _REF_OFFSET]:
+                    return offset
+                self._map[offset + _REF_OFFSET] = 0
+
+    def _locked(self):
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        return _FileLock(self._lock, self._fd)
+
+
+class _FileLock:
+    def __init__(self, lock: threading.Lock, fd: int):
+        self._lock = lock
+        self._fd = fd
+
+    def __enter__(self):
+        self._lock.acquire()
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 0, 0, os.SEEK_SET)
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 0, 0, os.SEEK_SET)
+        self._lock.release()
+
+
+def _digest(key: bytes) -> bytes:
+    return blake2b(key, digest_size=16).digest()
@@ -0,0 +1,220 @@
+import logging
+import random
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Tuple, Iterator, BinaryIO, Awaitable, Deque
+
+from liteapi.buffering import BufferedWriter
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'LTRAFFIC\x01'
+
+_LENGTH = struct.Struct('<I')
+_PREFIX = struct.Struct('<dHBHHHI')
+_HEADER = struct.Struct('<HH')
+_MAX_FIELD = 0xFFFF
+
+DEFAULT_REDACTED_HEADERS = ('authorization', 'cookie', 'proxy-authorization', 'x-api-key')
+
+
+@dataclass
+class CapturedRequest:
+    offset: float
+    method: str
+    path: str
+    query_string: bytes
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    status: int = 0
+
+    def to_scope(self) -> dict:
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': '1.1',
+            'server': ('replay', 80),
+            'client': ('replay', 0),
+            'scheme': 'http',
+            'method': self.method,
+            'root_path': '',
+            'path': self.path,
+            'raw_path': self.path.encode(),
+            'query_string': self.query_string,
+            'headers': list(self.headers),
+        }
+
+    def dumps(self) -> bytes:
+        method = self.method.encode()
+        path = self.path.encode()
+        parts = [
+            _PREFIX.pack(
+                self.offset, self.status, len(method), len(path), len(self.query_string), len(self.headers),
+                len(self.body)
+            ),
+            method, path, self.query_string,
+        ]
+        for name, value in self.headers:
+            parts += [_HEADER.pack(len(name), len(value)), name, value]
+        parts.append(self.body)
+
+        payload = b''.join(parts)
+        return _LENGTH.pack(len(payload)) + payload
+
+    @classmethod
+    def loads(cls, payload: bytes) -> 'CapturedRequest':
+        offset, status, method_size, path_size, query_size, header_count, body_size = _PREFIX.unpack_from(payload)
+        position = _PREFIX.size
+        method = payload[position:position + method_size].decode()
+        position += method_size
+        path = payload[position:position + path_size].decode()
+        position += path_size
+        query_string = payload[position:position + query_size]
+        position += query_size
+
+        headers = []
+        for _ in range(header_count):
+            name_size, value_size = _HEADER.unpack_from(payload, position)
+            name_end = position + _HEADER.size + name_size
+            headers.append((payload[position + _HEADER.size:name_end], payload[name_end:name_end + value_size]))
+            position = name_end + value_size
+
+        body = payload[position:position + body_size]
+        return cls(offset, method, path, query_string, headers, body, status)
+
+
+class TrafficRecorder(BufferedWriter):
+    """Samples HTTP requests reaching the app into a compact binary log that ``liteapi.replay`` can drive.
+
+    Values of ``redact_headers`` are replaced before anything is written, and requests whose body exceeds
+    ``max_body_size`` are skipped rather than truncated so that every record stays replayable. Records are
+    encoded on the writer thread, so the request path only pays for copying the request.
+    """
+
+    thread_name = 'liteapi-traffic-recorder'
+
+    def __init__(
+            self,
+            path: str,
+            *,
+            sample_rate: float = 1.0,
+            redact_headers: Iterable[str] = DEFAULT_REDACTED_HEADERS,
+            redaction: bytes = b'[redacted]',
+            max_body_size: int = 1 << 20,
+            buffer_size: int = 10000,
+            flush_interval: float = 1.0
+    ):
+        super().__init__(buffer_size=buffer_size, flush_interval=flush_interval)
+        self.path = path
+        self.sample_rate = sample_rate
+        self.redact_headers = frozenset(name.lower().encode() for name in redact_headers)
+        self.redaction = redaction
+        self.max_body_size = max_body_size
+
+        self._started = time.monotonic()
+        self._recorded = 0
+        self._oversized = 0
+        self._unencodable = 0
+
+    @property
+    def recorded(self) -> int:
+        return self._recorded
+
+    @property
+    def skipped(self) -> int:
+        return self._oversized + self._unencodable
+
+    async def record(self, scope: dict, receive: Callable, send: Callable,
+                     app: Callable[[dict, Callable, Callable], Awaitable[None]]):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            await app(scope, receive, send)
+            return
+
+        offset = time.monotonic() - self._started
+        chunks = []
+        unread: Deque[dict] = deque()
+        complete = False
+        status = 0
+
+        async def read():
+            nonlocal complete
+            message = await receive()
+            if message['type'] == 'http.request':
+                chunks.append(message.get('body', b''))
+                complete = not message.get('more_body', False)
+            elif message['type'] == 'http.disconnect':
+                complete = True
+            return message
+
+        async def capture_receive():
+            return unread.popleft() if unread else await read()
+
+        async def capture_send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                # Requests answered before their body was read would otherwise be captured without it
+                size = sum(map(len, chunks))
+                while not complete and size <= self.max_body_size:
+                    unread.append(await read())
+                    size += len(unread[-1].get('body', b''))
+            await send(message)
+
+        try:
+            await app(scope, capture_receive, capture_send)
+        finally:
+            self._enqueue(scope, chunks, status, offset)
+
+    def _enqueue(self, scope: dict, chunks: List[bytes], status: int, offset: float):
+        body = b''.join(chunks)
+        if len(body) > self.max_body_size:
+            self._oversized += 1
+            return
+
+        self._put(CapturedRequest(
+            offset, scope['method'], scope['path'], scope.get('query_string', b''),
+            self._headers(scope.get('headers', ())), body, status
+        ))
+
+    def _headers(self, headers: Iterable[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        return [
+            (name[:_MAX_FIELD], self.redaction if name.lower() in self.redact_headers else value[:_MAX_FIELD])
+            for name, value
+            in list(headers)[:_MAX_FIELD]
+        ]
+
+    def _open(self):
+        output = open(self.path, 'ab')
+        if output.tell() == 0:
+            output.write(MAGIC)
+        return output
+
+    def _flush(self, output: BinaryIO):
+        records = []
+        while self._buffer:
+            captured = self._buffer.popleft()
+            try:
+                records.append(captured.dumps())
+            except (struct.error, UnicodeEncodeError):
+                logger.warning('Skipping a %s capture that does not fit the record format', captured.method)
+                self._unencodable += 1
+
+        if records:
+            output.write(b''.join(records))
+            output.flush()
+            self._recorded += len(records)
+
+
+def read_traffic(path: str) -> Iterator[CapturedRequest]:
+    with open(path, 'rb') as log:
+        if log.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a traffic capture')
+
+        while len(header := log.read(_LENGTH.size)) == _LENGTH.size:
+            size = _LENGTH.unpack(header)[0]
+            payload = log.read(size)
+            if len(payload) != size:
+                return
+            yield CapturedRequest.loads(payload)
@@ -0,0 +1,92 @@
+import asyncio
+import struct
+from typing import Dict, Hashable, Callable, Awaitable, List
+
+from liteapi.binding import INJECTED
+from liteapi.requests import Request
+from liteapi.responses import Response, BinaryResponse, collect_body
+
+_PREFIX = struct.Struct('<HHH')
+_HEADER = struct.Struct('<HH')
+
+
+class EncodedResponse:
+    def __init__(self, response: Response, body: bytes):
+        self.status_code = response.status_code
+        self.content_type = response.content_type
+        self.headers: List[List[bytes]] = [list(header) for header in response.headers]
+        self.background = response.background
+        self.body = body
+
+    @classmethod
+    async def encode(cls, response: Response) -> 'EncodedResponse':
+        return cls(response, await collect_body(response))
+
+    def dumps(self) -> bytes:
+        content_type = (self.content_type or '').encode()
+        parts = [_PREFIX.pack(self.status_code, len(content_type), len(self.headers)), content_type]
+        for name, value in self.headers:
+            parts += [_HEADER.pack(len(name), len(value)), name, value]
+        parts.append(self.body)
+        return b''.join(parts)
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'EncodedResponse':
+        status_code, content_type_size, header_count = _PREFIX.unpack_from(data)
+        offset = _PREFIX.size + content_type_size
+        encoded = cls.__new__(cls)
+        encoded.status_code = status_code
+        encoded.content_type = data[_PREFIX.size:offset].decode() or None
+        encoded.headers = []
+        for _ in range(header_count):
+            name_size, value_size = _HEADER.unpack_from(data, offset)
+            name_end = offset + _HEADER.size + name_size
+            encoded.headers.append([data[offset + _HEADER.size:name_end], data[name_end:name_end + value_size]])
+            offset = name_end + value_size
+        encoded.background = None
+        encoded.body = data[offset:]
+        return encoded
+
+    def copy(self) -> Response:
+        response = BinaryResponse(self.body, self.status_code, self.content_type)
+        response.headers[:] = [list(header) for header in self.headers]
+        response.background, self.background = self.background, None
+        return response
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Response]]) -> Response:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._run(func))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+
+        encoded = await asyncio.shield(flight)
+        return encoded.copy()
+
+    @staticmethod
+    async def _run(func: Callable[[], Awaitable[Response]]) -> EncodedResponse:
+        return await EncodedResponse.encode(await func())
+
+    def _land(self, key: Hashable, flight: asyncio.Task):
+        del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()
+
+
+def flight_key(request: Request) -> Hashable:
+    args = tuple(
+        (name, repr(value))
+        for name, value
+        in sorted(request.args.items())
+        if not isinstance(value, INJECTED)
+    )
+    return request.scope.method, request.scope.path, args
@@ -0,0 +1,113 @@
+import re
+from typing import Iterable, Tuple, Optional, Mapping
+
+from liteapi.responses import Response, JSONResponse
+
+Headers = Tuple[Tuple[bytes, bytes], ...]
+
+_DEFAULT_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD')
+
+
+class PreflightResponse(Response):
+    __slots__ = ()
+
+    def __init__(self, headers: Headers):
+        self.data = b''
+        self.status_code = 204
+        self.content_type = None
+        self.background = None
+        self._headers = headers
+
+    def to_bytes(self) -> bytes:
+        return b''
+
+
+class CORSPolicy:
+    def __init__(
+            self,
+            allow_origins: Iterable[str] = ('*',),
+            *,
+            allow_origin_regex: str = None,
+            allow_methods: Iterable[str] = _DEFAULT_METHODS,
+            allow_headers: Iterable[str] = (),
+            expose_headers: Iterable[str] = (),
+            allow_credentials: bool = False,
+            max_age: int = 600
+    ):
+        origins = set(allow_origins)
+        self.any_origin = '*' in origins
+        self.allow_methods = frozenset(method.upper() for method in allow_methods)
+        self.any_header = '*' in allow_headers
+        self.allow_headers = frozenset(header.lower() for header in allow_headers)
+        self.allow_credentials = allow_credentials
+
+        self._origins = frozenset(origin for origin in origins if '*' not in origin)
+        patterns = [
+            re.escape(origin).replace(r'\*', '[^./]+')
+            for origin
+            in origins
+            if '*' in origin and origin != '*'
+        ]
+        if allow_origin_regex:
+            patterns.append(allow_origin_regex)
+        self._origin_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)) if patterns else None
+
+        self._wildcard = self.any_origin and not allow_credentials
+        common = []
+        if allow_credentials:
+            common.append((b'access-control-allow-credentials', b'true'))
+        if not self._wildcard:
+            common.append((b'vary', b'origin'))
+
+        self._simple_headers: Headers = tuple(common)
+        if expose_headers:
+            self._simple_headers += (b'access-control-expose-headers', ', '.join(expose_headers).encode()),
+
+        self._preflight_headers: Headers = (
+            *common,
+            (b'access-control-allow-methods', ', '.join(sorted(self.allow_methods)).encode()),
+            (b'access-control-max-age', str(max_age).encode()),
+        )
+        if self.allow_headers and not self.any_header:
+            allowed = ', '.join(sorted(self.allow_headers)).encode()
+            self._preflight_headers += (b'access-control-allow-headers', allowed),
+
+    def allows_origin(self, origin: str) -> bool:
+        if self.any_origin or origin in self._origins:
+            return True
+        return self._origin_regex is not None and self._origin_regex.fullmatch(origin) is not None
+
+    def preflight(self, headers: Mapping[str, str]) -> Response:
+        origin = headers.get('origin')
+        method = headers.get('access-control-request-method', '').upper()
+        if origin is None or not self.allows_origin(origin) or method not in self.allow_methods:
+            return JSONResponse({'message': 'Disallowed CORS request'}, 400)
+
+        requested_headers = headers.get('access-control-request-headers')
+        allow_headers = self._allowed_headers(requested_headers)
+        if allow_headers is None:
+            return JSONResponse({'message': 'Disallowed CORS request'}, 400)
+
+        response_headers = (self._allow_origin(origin), *self._preflight_headers)
+        if allow_headers:
+            response_headers += (b'access-control-allow-headers', allow_headers),
+        return PreflightResponse(response_headers)
+
+    def apply(self, response: Response, origin: str) -> Response:
+        if self.allows_origin(origin):
+            response.headers.extend((self._allow_origin(origin), *self._simple_headers))
+        return response
+
+    def _allow_origin(self, origin: str) -> Tuple[bytes, bytes]:
+        return b'access-control-allow-origin', b'*' if self._wildcard else origin.encode()
+
+    def _allowed_headers(self, requested: Optional[str]) -> Optional[bytes]:
+        if not requested:
+            return b''
+        if self.any_header:
+            return requested.encode()
+
+        names = [name.strip().lower() for name in requested.split(',') if name.strip()]
+        if all(name in self.allow_headers for name in names):
+            return b''
+        return None
@@ -0,0 +1,39 @@
+from time import monotonic
+from typing import Optional
+
+
+class Deadline:
+    def __init__(self, timeout: Optional[float] = None):
+        self._timeout = timeout
+        self._expires_at = monotonic() + timeout if timeout is not None else None
+
+    @classmethod
+    def from_budgets(cls, route_budget: Optional[float], header_budget: Optional[float]) -> 'Deadline':
+        if route_budget is None:
+            return UNBOUNDED if header_budget is None else cls(header_budget)
+        elif header_budget is None:
+            return cls(route_budget)
+        return cls(min(route_budget, header_budget))
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    @property
+    def bounded(self) -> bool:
+        return self._expires_at is not None
+
+    @property
+    def expired(self) -> bool:
+        return self.bounded and monotonic() >= self._expires_at
+
+    def remaining(self) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        return max(self._expires_at - monotonic(), 0.0)
+
+    def __repr__(self):
+        return f'Deadline(remaining={self.remaining()})'
+
+
+UNBOUNDED = Deadline()
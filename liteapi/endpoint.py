@@ -1,10 +1,23 @@
+import asyncio
 import inspect
 from dataclasses import dataclass, field
+from functools import partial
 from inspect import signature, Signature
-from typing import Callable, List, Type
+from typing import Callable, List, Type, Tuple, Union, TYPE_CHECKING
 
+from liteapi.binding import Binding, compile_bindings
+from liteapi.caching import ResponseCache
+from liteapi.coalescing import SingleFlight, EncodedResponse, flight_key
+from liteapi.cors import CORSPolicy
+from liteapi.limits import ConcurrencyLimit
 from liteapi.requests import Request
-from liteapi.responses import response_factory, Response
+from liteapi.negotiation import prefers_msgpack, prefers_ndjson
+from liteapi.responses import response_factory, Response, negotiate
+from liteapi.streaming import DEFAULT_MAX_LINE_SIZE
+from liteapi.websockets import WebSocketOptions, WebSocketDisconnect
+
+if TYPE_CHECKING:
+    from liteapi.profiling import ProfileSession
 
 
 @dataclass
@@ -15,34 +28,109 @@ class Endpoint:
     content_type: str
     returns: Type = None
     tags: List[str] = None
+    timeout: float = None
+    coalesce: bool = False
+    websocket: WebSocketOptions = None
+    route: str = None
+    max_line_size: int = DEFAULT_MAX_LINE_SIZE
+    cache_ttl: float = None
+    cache: ResponseCache = field(default=None, repr=False)
+    cors: CORSPolicy = field(default=None, repr=False)
+    limits: List[ConcurrencyLimit] = field(default_factory=list, repr=False)
     signature: Signature = field(init=False, repr=False)
+    bindings: Tuple[Binding, ...] = field(init=False, repr=False)
 
     preprocessors: List[Callable] = field(init=False, repr=False)
     postprocessors: List[Callable] = field(init=False, repr=False)
+    single_flight: SingleFlight = field(init=False, repr=False)
+    profile: 'ProfileSession' = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
         self.signature = signature(self.func)
+        self.bindings = compile_bindings(self.signature, self.max_line_size)
+        self._is_coroutine = inspect.iscoroutinefunction(self.func)
+        self.single_flight = SingleFlight() if self.coalesce else None
 
         self.preprocessors = []
         self.postprocessors = []
 
     async def process(self, request: Request) -> Response:
+        profile = request.profile or self.profile
+        if profile is not None and profile.claim():
+            return await profile.run(self, request)
+
+        request = await self.preprocess(request)
+        if isinstance(request, Response):
+            return request
+
+        response = await self.handle(request)
+        return await self.postprocess(response)
+
+    async def preprocess(self, request: Request) -> Union[Request, Response]:
         for preprocessor in self.preprocessors:
             request = await preprocessor(request)
             if isinstance(request, Response):
                 return request
+        return request
 
-        response = await self._process_func(**request.args)
+    async def handle(self, request: Request) -> Response:
+        accept = request.scope.headers.get('accept')
+        if self.single_flight is None and self.cache is None:
+            return await self._respond(request, accept)
 
+        key = (flight_key(request), prefers_msgpack(accept), prefers_ndjson(accept))
+        respond = partial(self._respond, request, accept)
+        if self.cache is not None:
+            cache_key = repr(key).encode()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return EncodedResponse.loads(cached).copy()
+            respond = partial(self._respond_cached, cache_key, request, accept)
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(key, respond)
+        return await respond()
+
+    async def postprocess(self, response: Response) -> Response:
         for postprocessor in self.postprocessors:
             response = await postprocessor(response)
         return response
 
-    async def _process_func(self, *args, **kwargs) -> Response:
-        if inspect.iscoroutinefunction(self.func):
-            result = await self.func(*args, **kwargs)
+    async def process_websocket(self, request: Request):
+        socket = request.websocket
+        for preprocessor in self.preprocessors:
+            request = await preprocessor(request)
+            if isinstance(request, Response):
+                await socket.close(1008)
+                return
+
+        await socket.accept()
+        try:
+            await self.func(**request.args)
+        except WebSocketDisconnect:
+            pass
+        except Exception:
+            await socket.close(1011)
+            raise
+        await socket.close()
+
+    async def _respond(self, request: Request, accept: str) -> Response:
+        response = await self._process_func(request.args, offload=request.deadline.bounded)
+        return negotiate(response, accept)
+
+    async def _respond_cached(self, key: bytes, request: Request, accept: str) -> Response:
+        encoded = await EncodedResponse.encode(await self._respond(request, accept))
+        if encoded.status_code == 200:
+            self.cache.set(key, encoded.dumps(), self.cache_ttl)
+        return encoded.copy()
+
+    async def _process_func(self, kwargs: dict, offload: bool = False) -> Response:
+        if self._is_coroutine:
+            result = await self.func(**kwargs)
+        elif offload:
+            result = await asyncio.to_thread(self.func, **kwargs)
         else:
-            result = self.func(*args, **kwargs)
+            result = self.func(**kwargs)
 
         match result:
             case Response():
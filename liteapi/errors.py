@@ -5,7 +5,7 @@ from pydantic import ValidationError
 from liteapi.responses import JSONResponse
 
 
-class ParsingError(ABC):
+class ParsingError(Exception, ABC):
     @abstractmethod
     def to_request(self) -> JSONResponse:
         pass
@@ -54,3 +54,41 @@ class MissingRequiredError(KeyError, ParsingError):
             }
         }
         return JSONResponse(response, 400)
+
+
+class UnsupportedMediaTypeError(ValueError, ParsingError):
+    def __init__(self, param_name, content_type, expected, *args):
+        super().__init__(*args)
+        self.param_name = param_name
+        self.content_type = content_type
+        self.expected = expected
+
+    def to_request(self):
+        response = {
+            'message': 'Unsupported media type',
+            'details': {
+                'param_name': self.param_name,
+                'content_type': self.content_type,
+                'expected': self.expected
+            }
+        }
+        return JSONResponse(response, 415)
+
+
+class StreamLineError(ValueError, ParsingError):
+    def __init__(self, line_number, reason, details=None, *args):
+        super().__init__(*args)
+        self.line_number = line_number
+        self.reason = reason
+        self.details = details
+
+    def to_request(self):
+        response = {
+            'message': 'Invalid stream line',
+            'details': {
+                'line': self.line_number,
+                'reason': self.reason,
+                'errors': self.details
+            }
+        }
+        return JSONResponse(response, 400)
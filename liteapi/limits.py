@@ -0,0 +1,90 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Any
+
+from liteapi.responses import JSONResponse, Response
+
+
+class ConcurrencyLimit:
+    def __init__(
+            self,
+            max_in_flight: int,
+            *,
+            max_queue: int = 0,
+            queue_timeout: float = None,
+            retry_after: int = 1
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._in_flight = 0
+        self._rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': self._in_flight,
+            'queue_depth': len(self._waiters),
+            'rejected': self._rejected,
+            'max_in_flight': self.max_in_flight,
+            'max_queue': self.max_queue,
+        }
+
+    async def acquire(self) -> bool:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self._rejected += 1
+            return False
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        return True
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._in_flight -= 1
+
+    def overloaded_response(self) -> Response:
+        response = JSONResponse({'message': 'Service overloaded'}, 503)
+        response.add_header('retry-after', str(self.retry_after))
+        return response
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
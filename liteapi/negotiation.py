@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK = 'application/msgpack'
+MSGPACK_TYPES = (MSGPACK, 'application/x-msgpack')
+NDJSON = 'application/x-ndjson'
+NDJSON_TYPES = (NDJSON, 'application/ndjson')
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, BaseModel):
+        return o.dict()
+    raise TypeError(f'Object of type {type(o).__name__} is not msgpack serializable')
+
+
+def pack(data: Any) -> bytes:
+    return msgpack.packb(data, default=_default)
+
+
+def unpack(body: bytes) -> Any:
+    return msgpack.unpackb(body, raw=False)
+
+
+@lru_cache(maxsize=256)
+def prefers_msgpack(accept: str) -> bool:
+    if msgpack is None or not accept:
+        return False
+    return _prefers_over_json(accept, MSGPACK_TYPES)
+
+
+@lru_cache(maxsize=256)
+def prefers_ndjson(accept: str) -> bool:
+    if not accept:
+        return False
+    return _prefers_over_json(accept, NDJSON_TYPES)
+
+
+def _prefers_over_json(accept: str, media_types: Tuple[str, ...]) -> bool:
+    weights = _parse_accept(accept)
+    weight = max(weights.get(media_type, 0.0) for media_type in media_types)
+    json_weight = max(
+        weights.get('application/json', 0.0),
+        weights.get('application/*', 0.0),
+        weights.get('*/*', 0.0)
+    )
+    return weight > 0 and weight >= json_weight
+
+
+def _parse_accept(accept: str) -> Dict[str, float]:
+    weights = {}
+    for item in accept.split(','):
+        media_type, *params = item.strip().split(';')
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[media_type.strip().lower()] = weight
+    return weights
@@ -7,7 +7,8 @@ from typing import Dict, get_origin, get_args, Set, Type, Optional, Any, Tuple,
 from pydantic import BaseModel
 
 from liteapi.endpoint import Endpoint
-from liteapi.parsing import is_optional
+from liteapi.negotiation import MSGPACK, NDJSON_TYPES, msgpack_available
+from liteapi.binding import is_optional, is_injected, is_body_stream
 from liteapi.responses import HTMLResponse, JSONResponse
 
 
@@ -63,6 +64,7 @@ class OpenAPI:
                 method.lower(): self._get_endpoint_data(endpoint, path)
                 for method, endpoint
                 in endpoints.items()
+                if endpoint.websocket is None
             }
 
         components = {
@@ -109,6 +111,7 @@ class OpenAPI:
         params = []
         json_content = {}
         form_data = {}
+        stream_content = {}
         content: Dict[str, Dict] = {}
 
         for name, param in endpoint.signature.parameters.items():
@@ -117,7 +120,14 @@ class OpenAPI:
             else:
                 type_ = param.annotation
 
-            if issubclass(type_, BaseModel):
+            if is_injected(type_):
+                continue
+            elif is_body_stream(type_):
+                item_type = get_args(type_)[0] if get_args(type_) else Any
+                stream_content = {
+                    'schema': self._parse_return_annotation(item_type)
+                }
+            elif issubclass(type_, BaseModel):
                 self._schemas.add(type_)
                 json_content = {
                     'schema': {
@@ -146,6 +156,10 @@ class OpenAPI:
 
         if json_content:
             content['application/json'] = json_content
+            if msgpack_available():
+                content[MSGPACK] = json_content
+        if stream_content:
+            content[NDJSON_TYPES[0]] = stream_content
         if form_data:
             content['multipart/form-data'] = {
                 'schema': {
@@ -189,13 +203,19 @@ class OpenAPI:
 
     def _get_responses(self, endpoint: Endpoint) -> Optional[Dict[str, Any]]:
         response_schema = self._parse_return_annotation(endpoint.returns)
+        content = {
+            endpoint.content_type: {
+                'schema': response_schema
+            }
+        }
+        if endpoint.content_type == 'application/json' and msgpack_available():
+            content[MSGPACK] = {
+                'schema': response_schema
+            }
+
         return {
             str(endpoint.status_code): {
-                'content': {
-                    endpoint.content_type: {
-                        'schema': response_schema
-                    }
-                }
+                'content': content
             }
         }
 
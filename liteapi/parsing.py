@@ -1,129 +1,135 @@
+import asyncio
 import cgi
-import inspect
 import json
+from collections import ChainMap
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, Any, get_origin, Union, get_args, Callable, Tuple
+from typing import Dict, Any, Callable, Tuple, Mapping
 
-from parse import parse
-from pydantic import BaseModel
+from parse import Parser
 
+from liteapi.binding import bind_args
 from liteapi.endpoint import Endpoint, not_found
-from liteapi.errors import ParsingError, ConversionError, MissingRequiredError
+from liteapi.errors import ParsingError
+from liteapi.negotiation import MSGPACK_TYPES, NDJSON_TYPES, msgpack_available, unpack
 from liteapi.requests import Request, RequestScope
-from liteapi.responses import Response
-
-
-class RequestParser:
-    def __init__(self, endpoints: Dict[str, Dict[str, Endpoint]], request_scope: RequestScope, receive: Callable):
-        self._endpoints = endpoints
-        self._request_scope = request_scope
-        self._receive = receive
-
-    async def extract_args_and_endpoint(self) -> Tuple[dict, Endpoint]:
-        method = self._request_scope.method
-        path = self._request_scope.path
-        content_type = self._request_scope.headers.get('content-type', None)
-
-        query_args = self._parse_query()
-        body_args = await self._parse_body(content_type)
-        endpoint, path_args = self._parse_path(path, method)
-
-        args = {**query_args, **path_args, **body_args}
-        return args, endpoint
-
-    def _parse_query(self) -> Dict[str, str]:
-        query_params = self._request_scope.query_string.decode()
-        args = {}
-        if query_params:
-            for param in query_params.split('&'):
-                key, value = param.split('=')
-                args[key] = value
-        return args
-
-    async def _parse_body(self, content_type: str) -> Dict[str, Any]:
-        if content_type:
-            body = await self._read_body()
-            if content_type == 'application/json':
-                return json.loads(body)
-            elif content_type.startswith('multipart/form-data'):
-                ctype, pdict = cgi.parse_header(content_type)
-                pdict['boundary'] = pdict['boundary'].encode("utf-8")  # noqa
-
-                fields = cgi.parse_multipart(BytesIO(body), pdict)  # noqa
-                return {
-                    key: value[0] if len(value) == 1 else value
-                    for key, value
-                    in fields.items()
-                }
-        return {}
-
-    async def _read_body(self) -> bytes:
-        body = b''
-        more_body = True
-
-        while more_body:
-            message = await self._receive()
-            body += message.get('body', b'')
-            more_body = message.get('more_body', False)
+from liteapi.responses import Response, JSONResponse
+
+_empty: Mapping[str, Any] = {}
+
+
+@lru_cache(maxsize=None)
+def compile_route(route: str) -> Parser:
+    return Parser(route)
 
-        return body
 
-    def _parse_path(self, path: str, method: str) -> Tuple[Endpoint, Dict[str, Any]]:
-        for route, endpoints in self._endpoints.items():
-            path_match = parse(route, path)
-            if path_match:
-                endpoint = endpoints.get(
+def match_endpoint(endpoints: Dict[str, Dict[str, Endpoint]], path: str, method: str) \
+        -> Tuple[Endpoint, Mapping[str, Any]]:
+    for route, route_endpoints in endpoints.items():
+        path_match = compile_route(route).parse(path)
+        if path_match:
+            if method == 'WEBSOCKET':
+                endpoint = route_endpoints.get(method, not_found)
+            elif method == 'HEAD' and 'HEAD' not in route_endpoints and 'GET' in route_endpoints:
+                endpoint = route_endpoints['GET']
+            else:
+                endpoint = route_endpoints.get(
                     method,
-                    endpoints.get('ANY', not_found)
+                    route_endpoints.get('ANY', not_found)
                 )
-                return endpoint, path_match.named
+            return endpoint, path_match.named
 
-        return not_found, {}
+    return not_found, _empty
 
 
-class EndpointProcessor:
-    def __init__(self, endpoint: Endpoint, request: Request):
-        self._endpoint = endpoint
-        self._request = request
+async def extract_sources(scope: RequestScope, receive: Callable, path_args: Mapping[str, Any]) -> ChainMap:
+    query_args = parse_query(scope.query_string)
+    body_args = await parse_body(scope, receive)
+    return ChainMap(body_args, path_args, query_args)
 
-    async def execute(self) -> Response:
-        try:
-            self._validate_and_convert_args()
-        except ParsingError as e:
-            return e.to_request()
 
-        return await self._endpoint.process(self._request)
+def extract_websocket_sources(scope: RequestScope, path_args: Mapping[str, Any]) -> ChainMap:
+    return ChainMap(path_args, parse_query(scope.query_string))
 
-    def _validate_and_convert_args(self):
-        parsed_args = {}
-        for param in self._endpoint.signature.parameters.values():
-            cls = param.annotation
-            optional = is_optional(param)
 
-            try:
-                if optional:
-                    cls = extract_from_optional(param)
-                if issubclass(cls, BaseModel):
-                    arg = cls(**self._request.args)
-                else:
-                    arg = cls(self._request.args[param.name])
-            except ValueError:
-                raise ConversionError(param.name, cls.__name__, self._request.args[param.name])
-            except KeyError:
-                if optional:
-                    arg = None
-                elif param.default == inspect.Parameter.empty:
-                    raise MissingRequiredError(param.name, cls.__name__)
-                else:
-                    arg = param.default
+def parse_query(query_string: bytes) -> Mapping[str, str]:
+    if not query_string:
+        return _empty
 
-            parsed_args[param.name] = arg
-        self._request.args = parsed_args
+    args = {}
+    for param in query_string.decode().split('&'):
+        key, value = param.split('=')
+        args[key] = value
+    return args
 
 
-def is_optional(param: inspect.Parameter):
-    return get_origin(param.annotation) is Union and type(None) in get_args(param.annotation)
+async def parse_body(scope: RequestScope, receive: Callable) -> Mapping[str, Any]:
+    content_type = scope.headers.get('content-type', None)
+    if content_type and content_type.split(';')[0].strip() not in NDJSON_TYPES:
+        body = await read_body(receive)
+        if content_type == 'application/json':
+            return json.loads(body)
+        elif content_type in MSGPACK_TYPES and msgpack_available():
+            return unpack(body)
+        elif content_type.startswith('multipart/form-data'):
+            ctype, pdict = cgi.parse_header(content_type)
+            pdict['boundary'] = pdict['boundary'].encode("utf-8")  # noqa
 
+            fields = cgi.parse_multipart(BytesIO(body), pdict)  # noqa
+            return {
+                key: value[0] if len(value) == 1 else value
+                for key, value
+                in fields.items()
+            }
+    return _empty
+
+
+async def read_body(receive: Callable) -> bytes:
+    message = await receive()
+    body = message.get('body', b'')
+    if not message.get('more_body', False):
+        return body
 
-def extract_from_optional(param: inspect.Parameter):
-    return get_args(param.annotation)[0]
+    chunks = [body]
+    while message.get('more_body', False):
+        message = await receive()
+        chunks.append(message.get('body', b''))
+    return b''.join(chunks)
+
+
+async def execute(endpoint: Endpoint, request: Request, sources: Mapping[str, Any]) -> Response:
+    try:
+        request.args = bind_args(endpoint.bindings, request, sources)
+    except ParsingError as e:
+        return e.to_request()
+
+    deadline = request.deadline
+    try:
+        if not deadline.bounded:
+            response = await endpoint.process(request)
+        else:
+            response = await asyncio.wait_for(endpoint.process(request), deadline.remaining())
+    except asyncio.TimeoutError:
+        if not deadline.expired:
+            raise
+        return JSONResponse({'message': 'Request timed out'}, 504)
+    except ParsingError as e:
+        return e.to_request()
+
+    background = request.background
+    if background:
+        if response.background is None:
+            response.background = background
+        else:
+            response.background.extend(background)
+    return response
+
+
+async def execute_websocket(endpoint: Endpoint, request: Request, sources: Mapping[str, Any]):
+    try:
+        request.args = bind_args(endpoint.bindings, request, sources)
+    except ParsingError:
+        await request.websocket.close(1008)
+        return
+
+    await endpoint.process_websocket(request)
@@ -0,0 +1,243 @@
+import cProfile
+import hmac
+import io
+import itertools
+import os
+import pstats
+import re
+import tracemalloc
+from collections import deque
+from time import perf_counter
+from typing import Dict, Any, List, Optional, Deque
+
+from liteapi.middleware import PreMiddleware
+from liteapi.requests import Request
+from liteapi.responses import Response, JSONResponse
+from liteapi.routing import Router
+
+_active = False
+
+
+class ProfileSession:
+    def __init__(
+            self,
+            session_id: int,
+            method: str,
+            route: str,
+            requests: int,
+            output_dir: str,
+            trace_memory: bool = False,
+            endpoint=None
+    ):
+        self.session_id = session_id
+        self.method = method
+        self.route = route
+        self.requests = requests
+        self.output_dir = output_dir
+        self.trace_memory = trace_memory
+        self.records: List[Dict[str, Any]] = []
+
+        self._endpoint = endpoint
+        self._remaining = requests
+        self._started_tracemalloc = False
+
+    @property
+    def done(self) -> bool:
+        return self._remaining <= 0 and len(self.records) >= self.requests
+
+    def claim(self) -> bool:
+        if _active or self._remaining <= 0:
+            return False
+
+        self._remaining -= 1
+        if self._remaining == 0 and self._endpoint is not None and self._endpoint.profile is self:
+            self._endpoint.profile = None
+        return True
+
+    def cancel(self):
+        self._remaining = 0
+        self.requests = len(self.records)
+        if self._endpoint is not None and self._endpoint.profile is self:
+            self._endpoint.profile = None
+        if self._started_tracemalloc and not _active:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    async def run(self, endpoint, request: Request) -> Response:
+        global _active
+        _active = True
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        memory_before = tracemalloc.take_snapshot() if self.trace_memory else None
+
+        timings = {}
+        profile = cProfile.Profile()
+        start = perf_counter()
+        profile.enable()
+        try:
+            result = await endpoint.preprocess(request)
+            timings['preprocess'] = perf_counter() - start
+
+            if isinstance(result, Response):
+                response = result
+            else:
+                handler_start = perf_counter()
+                response = await endpoint.handle(result)
+                timings['handler'] = perf_counter() - handler_start
+
+                postprocess_start = perf_counter()
+                response = await endpoint.postprocess(response)
+                timings['postprocess'] = perf_counter() - postprocess_start
+        finally:
+            profile.disable()
+            _active = False
+            timings['total'] = perf_counter() - start
+            memory_after = tracemalloc.take_snapshot() if memory_before is not None else None
+            self._record(profile, timings, memory_before, memory_after)
+
+        return response
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'session_id': self.session_id,
+            'method': self.method,
+            'route': self.route,
+            'requests': self.requests,
+            'profiled': len(self.records),
+            'done': self.done,
+            'records': self.records,
+        }
+
+    def _record(self, profile: cProfile.Profile, timings: Dict[str, float], memory_before, memory_after):
+        index = len(self.records)
+        os.makedirs(self.output_dir, exist_ok=True)
+        base_name = os.path.join(self.output_dir, f'{self.session_id}_{_slug(self.method, self.route)}_{index}')
+
+        profile.dump_stats(f'{base_name}.pstats')
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(15)
+
+        record = {
+            'timings': timings,
+            'pstats': f'{base_name}.pstats',
+            'top': stream.getvalue(),
+        }
+
+        if memory_before is not None:
+            memory_after.dump(f'{base_name}.tracemalloc')
+            record['tracemalloc'] = f'{base_name}.tracemalloc'
+            record['allocations'] = [
+                str(stat)
+                for stat
+                in memory_after.compare_to(memory_before, 'lineno')[:10]
+            ]
+
+        self.records.append(record)
+        if self._started_tracemalloc and self._remaining <= 0:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+class Profiler:
+    def __init__(self, endpoints: Dict, output_dir: str = 'profiles', trigger_header: str = None,
+                 token: str = None, history: int = 20):
+        self._endpoints = endpoints
+        self.output_dir = output_dir
+        self.trigger_header = trigger_header.lower() if trigger_header else None
+        self._token = token
+        self._ids = itertools.count(1)
+        self._sessions: Deque[ProfileSession] = deque(maxlen=history)
+
+    def start(self, route: str, method: str = 'GET', requests: int = 10, trace_memory: bool = False) \
+            -> ProfileSession:
+        endpoint = self._endpoints.get(route, {}).get(method.upper())
+        if endpoint is None:
+            raise KeyError(f'{method.upper()} {route}')
+
+        if endpoint.profile is not None:
+            endpoint.profile.cancel()
+
+        session = ProfileSession(
+            next(self._ids), method.upper(), route, requests, self.output_dir, trace_memory, endpoint
+        )
+        endpoint.profile = session
+        self._sessions.append(session)
+        return session
+
+    def triggered(self, request: Request) -> Optional[ProfileSession]:
+        value = request.scope.headers.get(self.trigger_header)
+        if value is None or not self.authorized(value):
+            return None
+
+        session = ProfileSession(
+            next(self._ids), request.scope.method, request.scope.path, 1, self.output_dir
+        )
+        self._sessions.append(session)
+        return session
+
+    def get(self, session_id: int) -> Optional[ProfileSession]:
+        for session in self._sessions:
+            if session.session_id == session_id:
+                return session
+        return None
+
+    def sessions(self) -> List[ProfileSession]:
+        return list(self._sessions)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return self._token is not None and token is not None and hmac.compare_digest(token, self._token)
+
+
+class ProfilerGuard(PreMiddleware):
+    def __init__(self, profiler: Profiler, header: str = 'x-profiler-token'):
+        self._profiler = profiler
+        self._header = header
+
+    async def preprocess(self, request: Request):
+        if not self._profiler.authorized(request.scope.headers.get(self._header)):
+            return JSONResponse({'message': 'Forbidden'}, 403)
+        return request
+
+
+def profiler_router(profiler: Profiler, prefix: str) -> Router:
+    router = Router(prefix, tags=['profiler'])
+    router.add_middleware(ProfilerGuard(profiler))
+
+    @router.post('/sessions')
+    def start_profiling(route: str, method: str = 'GET', requests: int = 10, trace_memory: str = 'false'):
+        try:
+            session = profiler.start(route, method, requests, _flag(trace_memory))
+        except KeyError:
+            return JSONResponse({'message': f'No such endpoint: {method.upper()} {route}'}, 404)
+        return session.summary(), 201
+
+    @router.get('/sessions')
+    def list_profiling_sessions():
+        return [session.summary() for session in profiler.sessions()]
+
+    @router.get('/sessions/{session_id}')
+    def get_profiling_session(session_id: int):
+        session = profiler.get(session_id)
+        if session is None:
+            return JSONResponse({'message': 'No such session'}, 404)
+        return session.summary()
+
+    @router.delete('/sessions/{session_id}')
+    def cancel_profiling_session(session_id: int):
+        session = profiler.get(session_id)
+        if session is None:
+            return JSONResponse({'message': 'No such session'}, 404)
+        session.cancel()
+        return session.summary()
+
+    return router
+
+
+def _flag(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _slug(method: str, route: str) -> str:
+    return method.lower() + re.sub(r'[^A-Za-z0-9]+', '_', route).rstrip('_')
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import importlib
+import json
+import math
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Any, Optional
+
+from liteapi.capture import CapturedRequest, read_traffic
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class RouteStats:
+    route: str
+    latencies: List[float] = field(default_factory=list, repr=False)
+    errors: int = 0
+    status_changes: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, percent: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'status_changes': self.status_changes,
+            'throughput': round(self.requests / elapsed, 2) if elapsed else 0.0,
+            **{f'p{percent}_ms': round(self.percentile(percent) * 1000, 3) for percent in PERCENTILES},
+            'max_ms': round(max(self.latencies, default=0.0) * 1000, 3),
+        }
+
+
+class ReplayReport:
+    def __init__(self, routes: Dict[str, RouteStats], elapsed: float, concurrency: int):
+        self.routes = routes
+        self.elapsed = elapsed
+        self.concurrency = concurrency
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.requests for stats in self.routes.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'elapsed': round(self.elapsed, 3),
+            'concurrency': self.concurrency,
+            'throughput': round(self.throughput, 2),
+            'routes': {route: stats.summary(self.elapsed) for route, stats in sorted(self.routes.items())},
+        }
+
+    def format(self) -> str:
+        columns = ('requests', 'errors', 'throughput', *(f'p{percent}_ms' for percent in PERCENTILES), 'max_ms')
+        width = max((len(route) for route in self.routes), default=5)
+        lines = [
+            f'{self.requests} requests in {self.elapsed:.3f}s at concurrency {self.concurrency} '
+            f'({self.throughput:.1f} req/s)',
+            f'{"route":<{width}}  ' + '  '.join(f'{column:>10}' for column in columns),
+        ]
+        for route, stats in sorted(self.routes.items()):
+            summary = stats.summary(self.elapsed)
+            lines.append(f'{route:<{width}}  ' + '  '.join(f'{summary[column]:>10}' for column in columns))
+        return '\n'.join(lines)
+
+
+async def replay(app: Callable, requests: Iterable[CapturedRequest], *, concurrency: int = 8, repeat: int = 1) \
+        -> ReplayReport:
+    workload = list(requests) * repeat
+    routes: Dict[str, RouteStats] = {}
+    pending = iter(workload)
+
+    async def worker():
+        for captured in pending:
+            key = _route_key(app, captured)
+            stats = routes.get(key)
+            if stats is None:
+                stats = routes[key] = RouteStats(key)
+
+            start = perf_counter()
+            status = await _drive(app, captured)
+            stats.latencies.append(perf_counter() - start)
+            if status >= 500:
+                stats.errors += 1
+            if captured.status and status != captured.status:
+                stats.status_changes += 1
+
+    async with _Lifespan(app):
+        start = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - start
+
+    return ReplayReport(routes, elapsed, concurrency)
+
+
+async def _drive(app: Callable, captured: CapturedRequest) -> int:
+    messages = [{'type': 'http.request', 'body': captured.body, 'more_body': False}]
+    status = 0
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    try:
+        await app(captured.to_scope(), receive, send)
+    except Exception:
+        return 500
+    return status
+
+
+def _route_key(app: Callable, captured: CapturedRequest) -> str:
+    route_for = getattr(app, 'route_for', None)
+    route = route_for(captured.method, captured.path) if route_for is not None else captured.path
+    return f'{captured.method} {route or "<unmatched>"}'
+
+
+class _Lifespan:
+    def __init__(self, app: Callable):
+        self._app = app
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._replies: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        self._task = asyncio.ensure_future(
+            self._app({'type': 'lifespan', 'asgi': {'version': '3.0'}}, self._messages.get, self._replies.put)
+        )
+        await self._exchange('lifespan.startup')
+
+    async def __aexit__(self, *exc_info):
+        await self._exchange('lifespan.shutdown')
+        if not self._task.done():
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _exchange(self, message_type: str):
+        if self._task.done():
+            return
+
+        await self._messages.put({'type': message_type})
+        reply = asyncio.ensure_future(self._replies.get())
+        await asyncio.wait((reply, self._task), return_when=asyncio.FIRST_COMPLETED)
+        reply.cancel()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m liteapi.replay', description='Replay captured traffic')
+    parser.add_argument('capture', help='traffic capture written by TrafficRecorder')
+    parser.add_argument('app', help='application to drive, as module:attribute')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    module_name, _, attribute = args.app.partition(':')
+    app = getattr(importlib.import_module(module_name), attribute or 'app')
+    report = asyncio.run(replay(app, read_traffic(args.capture), concurrency=args.concurrency, repeat=args.repeat))
+    print(json.dumps(report.summary(), indent=2) if args.json else report.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,77 @@
-from dataclasses import dataclass, field
-from typing import Dict, Tuple, List, Any
+from typing import Dict, Tuple, List, Any, Optional, Mapping, Callable
+
+from liteapi.background import BackgroundTasks
+from liteapi.deadlines import Deadline, UNBOUNDED
+from liteapi.websockets import WebSocket
 
 
-@dataclass
 class RequestScope:
-    type: str
-    asgi: Dict[str, str]
-    http_version: str
-    server: Tuple[str, int]
-    client: Tuple[str, int]
-    scheme: str
-    method: str
-    root_path: str
-    path: str
-    raw_path: bytes
-    query_string: bytes
-    headers: Dict[str, str]
-    _headers: Dict[str, str] = field(repr=False, init=False)
+    __slots__ = (
+        'type', 'asgi', 'http_version', 'server', 'client', 'scheme', 'method', 'root_path', 'path',
+        'raw_path', 'query_string', 'state', 'extensions', 'subprotocols', 'route', 'extra', '_raw_headers', '_headers'
+    )
+
+    def __init__(
+            self,
+            type: str,  # noqa
+            asgi: Dict[str, str],
+            http_version: str,
+            server: Tuple[str, int],
+            client: Tuple[str, int],
+            scheme: str,
+            method: str,
+            root_path: str,
+            path: str,
+            raw_path: bytes,
+            query_string: bytes,
+            headers: List[Tuple[bytes, bytes]],
+            state: Dict[str, Any] = None,
+            extensions: Dict[str, Any] = None,
+            subprotocols: List[str] = None,
+            **extra: Any
+    ):
+        self.type = type
+        self.asgi = asgi
+        self.http_version = http_version
+        self.server = server
+        self.client = client
+        self.scheme = scheme
+        self.method = method
+        self.root_path = root_path
+        self.path = path
+        self.raw_path = raw_path
+        self.query_string = query_string
+        self.state = state
+        self.extensions = extensions
+        self.subprotocols = subprotocols
+        self.route: Optional[str] = None
+        self.extra = extra
+        self._raw_headers = headers
+        self._headers = None
 
     @property
-    def headers(self):
+    def headers(self) -> Dict[str, str]:
+        if self._headers is None:
+            self._headers = {key.decode(): value.decode() for key, value in self._raw_headers}
         return self._headers
 
-    @headers.setter
-    def headers(self, headers: List[Tuple[bytes, bytes]]):
-        self._headers = {}
-        for key, value in headers:
-            self._headers[key.decode()] = value.decode()
+    @property
+    def raw_headers(self) -> List[Tuple[bytes, bytes]]:
+        return self._raw_headers
+
+    def __repr__(self):
+        return f'RequestScope(type={self.type!r}, method={self.method!r}, path={self.path!r})'
 
 
 class Request:
-    def __init__(self, scope: RequestScope, args: Dict[str, Any]):
+    __slots__ = ('scope', 'args', 'deadline', 'background', 'websocket', 'profile', 'receive')
+
+    def __init__(self, scope: RequestScope, args: Mapping[str, Any], deadline: Deadline = UNBOUNDED,
+                 receive: Callable = None):
         self.scope = scope
+        self.receive = receive
         self.args = args
+        self.deadline = deadline
+        self.background: Optional[BackgroundTasks] = None
+        self.websocket: Optional[WebSocket] = None
+        self.profile = None
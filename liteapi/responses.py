@@ -1,27 +1,45 @@
+import inspect
 import json
+from functools import lru_cache
 from json import JSONEncoder
-from typing import Any, Iterable, Callable, Union, Dict, List
+from typing import Any, Iterable, Callable, Union, Dict, List, Tuple, AsyncIterable, AsyncIterator
 
 from pydantic import BaseModel
 
+from liteapi.background import BackgroundTasks
+from liteapi.negotiation import MSGPACK, NDJSON, pack, prefers_msgpack, prefers_ndjson
+
+
+@lru_cache(maxsize=None)
+def header_block(content_type: str) -> Tuple[Tuple[bytes, bytes], ...]:
+    return (b'content-type', content_type.encode()),
+
 
 class Response:
-    def __init__(self, data: Any, status_code=200, content_type='text/plain'):
+    __slots__ = ('data', 'status_code', 'content_type', 'background', '_headers')
+    streaming = False
+
+    def __init__(self, data: Any, status_code=200, content_type='text/plain', background: BackgroundTasks = None):
         self.data = data
         self.status_code = status_code
         self.content_type = content_type
+        self.background = background
 
-        self._headers = [
-            [b'content-type', self.content_type.encode()],
-        ]
+        self._headers = header_block(content_type)
 
     def add_header(self, key: str, value: str):
-        self._headers.append([
+        self.headers.append((
             key.encode(), value.encode()
-        ])
+        ))
+
+    @property
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        if type(self._headers) is tuple:
+            self._headers = list(self._headers)
+        return self._headers
 
     @property
-    def headers(self) -> List[List[bytes]]:
+    def raw_headers(self) -> Iterable[Tuple[bytes, bytes]]:
         return self._headers
 
     def to_bytes(self) -> bytes:
@@ -37,41 +55,127 @@ class PydanticEncoder(JSONEncoder):
 
 
 class PlainResponse(Response):
-    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='text/plain'):
-        super().__init__(data, status_code, content_type)
+    __slots__ = ()
+
+    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='text/plain',
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
 
 
 class HTMLResponse(Response):
-    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='text/html'):
-        super().__init__(data, status_code, content_type)
+    __slots__ = ()
+
+    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='text/html',
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
 
 
 class JSONResponse(Response):
-    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='application/json'):
-        super().__init__(data, status_code, content_type)
+    __slots__ = ()
+
+    def __init__(self, data: Union[Dict, Any], status_code=200, content_type='application/json',
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
 
     def to_bytes(self) -> bytes:
         return json.dumps(self.data, cls=PydanticEncoder).encode()
 
 
+class MsgPackResponse(Response):
+    __slots__ = ()
+
+    def __init__(self, data: Union[Dict, Any], status_code=200, content_type=MSGPACK,
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
+
+    def to_bytes(self) -> bytes:
+        return pack(self.data)
+
+
 class BinaryResponse(Response):
-    def __init__(self, data: bytes, status_code=200, content_type='application/octet-stream'):
-        super().__init__(data, status_code, content_type)
+    __slots__ = ()
+
+    def __init__(self, data: bytes, status_code=200, content_type='application/octet-stream',
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
 
     def to_bytes(self) -> bytes:
         return self.data
 
 
 class ChunkedBinaryResponse(Response):
-    def __init__(self, data: Iterable[bytes], status_code=200, content_type='application/octet-stream'):
-        super().__init__(data, status_code, content_type)
+    __slots__ = ()
+    streaming = True
+
+    def __init__(self, data: Iterable[bytes], status_code=200, content_type='application/octet-stream',
+                 background: BackgroundTasks = None):
+        super().__init__(data, status_code, content_type, background)
 
     def to_bytes(self) -> bytes:
         yield from self.data
 
 
+class StreamingJSONResponse(Response):
+    __slots__ = ('batch_size',)
+    streaming = True
+
+    def __init__(self, data: Union[Iterable, AsyncIterable], status_code=200, content_type='application/json',
+                 background: BackgroundTasks = None, batch_size: int = 100):
+        super().__init__(data, status_code, content_type, background)
+        self.batch_size = batch_size
+
+    @property
+    def ndjson(self) -> bool:
+        return self.content_type == NDJSON
+
+    async def to_bytes(self) -> AsyncIterator[bytes]:
+        encode = PydanticEncoder().encode
+        separator = b'\n' if self.ndjson else b','
+        opening = b'' if self.ndjson else b'['
+
+        batch = []
+        async for item in _iterate(self.data):
+            batch.append(encode(item).encode())
+            if len(batch) >= self.batch_size:
+                yield self._chunk(opening, batch, separator)
+                opening = b'' if self.ndjson else b','
+                batch = []
+
+        if batch:
+            yield self._chunk(opening, batch, separator)
+            opening = b'' if self.ndjson else b','
+        if not self.ndjson:
+            yield b']' if opening == b',' else b'[]'
+
+    def _chunk(self, opening: bytes, batch: List[bytes], separator: bytes) -> bytes:
+        chunk = opening + separator.join(batch)
+        return chunk + b'\n' if self.ndjson else chunk
+
+
+async def _iterate(data: Union[Iterable, AsyncIterable]) -> AsyncIterator[Any]:
+    if hasattr(data, '__aiter__'):
+        async for item in data:
+            yield item
+    else:
+        for item in data:
+            yield item
+
+
+def is_stream(data: Any) -> bool:
+    return inspect.isgenerator(data) or inspect.isasyncgen(data)
+
+
+async def collect_body(response: Response) -> bytes:
+    body = response.to_bytes()
+    if isinstance(body, bytes):
+        return body
+    return b''.join([chunk async for chunk in _iterate(body)])
+
+
 def response_factory(data: Any, code, content_type):
-    if content_type == 'application/json':
+    if content_type in ('application/json', NDJSON) and is_stream(data):
+        cls = StreamingJSONResponse
+    elif content_type == 'application/json':
         cls = JSONResponse
     elif (content_type == 'application/octet-stream' or
           content_type.startswith('image') or
@@ -88,33 +192,73 @@ def response_factory(data: Any, code, content_type):
     return cls(data, code, content_type)
 
 
-class ResponseDispatcher:
-    def __init__(self, response: Response, send: Callable):
-        self._response = response
-        self._send = send
+def negotiate(response: Response, accept: str) -> Response:
+    if isinstance(response, StreamingJSONResponse):
+        if response.content_type == 'application/json' and prefers_ndjson(accept):
+            response.content_type = NDJSON
+            response.headers[:] = [
+                (b'content-type', NDJSON.encode()) if header[0] == b'content-type' else header
+                for header
+                in response.headers
+            ]
+        return response
 
-    async def send(self):
-        await self._send({
-            'type': 'http.response.start',
-            'status': self._response.status_code,
-            'headers': self._response.headers,
-        })
+    if type(response) is not JSONResponse or not prefers_msgpack(accept):
+        return response
 
-        body = self._response.to_bytes()
+    negotiated = MsgPackResponse(response.data, response.status_code, background=response.background)
+    negotiated.headers.extend(
+        header
+        for header
+        in response.headers
+        if header[0] != b'content-type'
+    )
+    return negotiated
 
-        if isinstance(self._response, ChunkedBinaryResponse):
-            for chunk in body:
-                await self._send({
-                    'type': 'http.response.body',
-                    'body': chunk,
-                    'more_body': True
-                })
-            await self._send({
-                'type': 'http.response.body',
-                'body': b'',
-            })
-        else:
-            await self._send({
+
+async def send_response(response: Response, send: Callable, head: bool = False) -> int:
+    if head:
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': response.raw_headers,
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'',
+        })
+        return 0
+    elif response.streaming:
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': response.raw_headers,
+        })
+        sent = 0
+        async for chunk in _iterate(response.to_bytes()):
+            sent += len(chunk)
+            await send({
                 'type': 'http.response.body',
-                'body': body,
+                'body': chunk,
+                'more_body': True
             })
+        await send({
+            'type': 'http.response.body',
+            'body': b'',
+        })
+        return sent
+    else:
+        body = response.to_bytes()
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                *response.raw_headers,
+                (b'content-length', str(len(body)).encode())
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': body,
+        })
+        return len(body)
@@ -1,14 +1,22 @@
-from typing import Dict, Callable, List, Type, Union
+from typing import Dict, Callable, List, Type, Union, Optional, Tuple
 
+from liteapi.caching import ResponseCache
+from liteapi.cors import CORSPolicy
 from liteapi.endpoint import Endpoint
+from liteapi.limits import ConcurrencyLimit
 from liteapi.middleware import PreMiddleware, PostMiddleware
+from liteapi.streaming import DEFAULT_MAX_LINE_SIZE
+from liteapi.websockets import WebSocketOptions
 
 
 class RoutingMixin:
     _endpoints: Dict[str, Dict[str, Endpoint]]
+    _limit: ConcurrencyLimit = None
+    _cache: ResponseCache = None
+    _cors: CORSPolicy = None
 
     def __init__(self):
-        self._middlewares = []
+        self._middlewares: List[Tuple[Union[PreMiddleware, PostMiddleware], Optional[str]]] = []
 
     def route(
             self,
@@ -17,49 +25,112 @@ class RoutingMixin:
             *,
             status_code: int = 200,
             content_type: str = 'application/json',
-            returns: Type = None
+            returns: Type = None,
+            limit: ConcurrencyLimit = None,
+            timeout: float = None,
+            coalesce: bool = False,
+            cache_ttl: float = None,
+            cache: ResponseCache = None,
+            max_line_size: int = DEFAULT_MAX_LINE_SIZE
     ):
         def decorator(func: Callable):
-            endpoint = Endpoint(func, method, status_code, content_type, returns)
-            for middleware in self._middlewares:
-                endpoint = middleware(endpoint)
+            endpoint = Endpoint(
+                func, method, status_code, content_type, returns,
+                timeout=timeout, coalesce=coalesce, max_line_size=max_line_size, cache_ttl=cache_ttl, cache=cache
+            )
+            return self._add_endpoint(path, endpoint, limit)
 
-            if self._endpoints.get(path):
-                self._endpoints[path].update({method: endpoint})
-            else:
-                self._endpoints[path] = {method: endpoint}
+        return decorator
 
-            return endpoint
+    def websocket(
+            self,
+            path: str,
+            *,
+            limit: ConcurrencyLimit = None,
+            send_queue_size: int = 64,
+            idle_timeout: float = None,
+            ping_interval: float = None,
+            ping_message: Union[str, bytes] = 'ping'
+    ):
+        options = WebSocketOptions(send_queue_size, idle_timeout, ping_interval, ping_message)
+
+        def decorator(func: Callable):
+            endpoint = Endpoint(func, 'WEBSOCKET', 101, None, websocket=options)
+            return self._add_endpoint(path, endpoint, limit)
 
         return decorator
 
-    def get(self, path: str, *, status_code: int = 200, content_type: str = 'application/json', returns: Type = None):
-        return self.route(path, 'GET', status_code=status_code, content_type=content_type, returns=returns)
+    def _add_endpoint(self, path: str, endpoint: Endpoint, limit: ConcurrencyLimit = None) -> Endpoint:
+        endpoint.route = path
+        if limit is not None:
+            endpoint.limits.append(limit)
+        if self._limit is not None:
+            endpoint.limits.append(self._limit)
+        if endpoint.cache_ttl and endpoint.cache is None:
+            endpoint.cache = self._cache
+        if endpoint.cors is None:
+            endpoint.cors = self._cors
+        for middleware, prefix in self._middlewares:
+            if in_scope(path, prefix):
+                endpoint = middleware(endpoint)
+
+        if self._endpoints.get(path):
+            self._endpoints[path].update({endpoint.http_method: endpoint})
+        else:
+            self._endpoints[path] = {endpoint.http_method: endpoint}
+
+        return endpoint
+
+    def get(self, path: str, **options):
+        return self.route(path, 'GET', **options)
+
+    def post(self, path: str, **options):
+        return self.route(path, 'POST', **options)
 
-    def post(self, path: str, *, status_code: int = 200, content_type: str = 'application/json', returns: Type = None):
-        return self.route(path, 'POST', status_code=status_code, content_type=content_type, returns=returns)
+    def put(self, path: str, **options):
+        return self.route(path, 'PUT', **options)
 
-    def put(self, path: str, *, status_code: int = 200, content_type: str = 'application/json', returns: Type = None):
-        return self.route(path, 'PUT', status_code=status_code, content_type=content_type, returns=returns)
+    def patch(self, path: str, **options):
+        return self.route(path, 'PATCH', **options)
 
-    def patch(self, path: str, *, status_code: int = 200, content_type: str = 'application/json', returns: Type = None):
-        return self.route(path, 'PATCH', status_code=status_code, content_type=content_type, returns=returns)
+    def delete(self, path: str, **options):
+        return self.route(path, 'DELETE', **options)
 
-    def delete(self, path: str, *, status_code: int = 200, content_type: str = 'application/json',
-               returns: Type = None):
-        return self.route(path, 'DELETE', status_code=status_code, content_type=content_type, returns=returns)
+    def add_middleware(self, middleware: Union[PreMiddleware, PostMiddleware], *, path: str = None):
+        self._middlewares.append((middleware, path))
+        for route, endpoints in self._endpoints.items():
+            if in_scope(route, path):
+                for method, endpoint in endpoints.items():
+                    endpoints[method] = middleware(endpoint)
 
-    def add_middleware(self, middleware: Union[PreMiddleware, PostMiddleware]):
-        self._middlewares.append(middleware)
+
+def in_scope(route: Optional[str], prefix: Optional[str]) -> bool:
+    if not prefix:
+        return True
+    if route is None:
+        return False
+    prefix = prefix.rstrip('/')
+    return route == prefix or route.startswith(prefix + '/')
 
 
 class Router(RoutingMixin):
-    def __init__(self, prefix: str = '', tags: List[str] = None):
+    def __init__(
+            self,
+            prefix: str = '',
+            tags: List[str] = None,
+            *,
+            limit: ConcurrencyLimit = None,
+            cache: ResponseCache = None,
+            cors: CORSPolicy = None
+    ):
         super().__init__()
 
         self.prefix = prefix
         self._endpoints: Dict[str, Dict[str, Endpoint]] = {}
         self._tags = tags
+        self._limit = limit
+        self._cache = cache
+        self._cors = cors
 
     @property
     def tags(self) -> List[str]:
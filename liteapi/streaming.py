@@ -0,0 +1,66 @@
+import json
+from inspect import isclass
+from typing import Callable, Type, Any, AsyncIterator
+
+from pydantic import BaseModel, ValidationError
+
+from liteapi.errors import StreamLineError
+
+DEFAULT_MAX_LINE_SIZE = 1 << 20
+
+
+class NDJSONStream:
+    def __init__(self, receive: Callable, item_type: Type = None, max_line_size: int = DEFAULT_MAX_LINE_SIZE):
+        self._receive = receive
+        self._item_type = item_type if isclass(item_type) and issubclass(item_type, BaseModel) else None
+        self._max_line_size = max_line_size
+        self._consumed = False
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        if self._consumed:
+            raise RuntimeError('Request body stream has already been consumed')
+        self._consumed = True
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        buffer = bytearray()
+        line_number = 0
+        more_body = True
+
+        while more_body:
+            message = await self._receive()
+            if message['type'] == 'http.disconnect':
+                raise StreamLineError(line_number + 1, 'Client disconnected before the end of the stream')
+            buffer += message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            start = 0
+            while (end := buffer.find(b'\n', start)) != -1:
+                line_number += 1
+                if end - start > self._max_line_size:
+                    raise StreamLineError(line_number, f'Line exceeds {self._max_line_size} bytes')
+                line = bytes(buffer[start:end])
+                start = end + 1
+                if line.strip():
+                    yield self._decode(line, line_number)
+            del buffer[:start]
+
+            if len(buffer) > self._max_line_size:
+                raise StreamLineError(line_number + 1, f'Line exceeds {self._max_line_size} bytes')
+
+        if buffer.strip():
+            yield self._decode(bytes(buffer), line_number + 1)
+
+    def _decode(self, line: bytes, line_number: int) -> Any:
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            raise StreamLineError(line_number, f'Invalid JSON: {e}')
+
+        if self._item_type is None:
+            return item
+
+        try:
+            return self._item_type(**item) if isinstance(item, dict) else self._item_type.parse_obj(item)
+        except ValidationError as e:
+            raise StreamLineError(line_number, 'Validation failed', json.loads(e.json()))
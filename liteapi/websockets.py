@@ -0,0 +1,136 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Callable, Union, Any, AsyncIterator, Optional
+
+from liteapi.responses import PydanticEncoder
+
+Message = Union[str, bytes]
+
+
+@dataclass
+class WebSocketOptions:
+    send_queue_size: int = 64
+    idle_timeout: float = None
+    ping_interval: float = None
+    ping_message: Message = 'ping'
+
+
+class WebSocketDisconnect(Exception):
+    def __init__(self, code: int = 1000, reason: str = ''):
+        super().__init__(code, reason)
+        self.code = code
+        self.reason = reason
+
+
+class WebSocket:
+    def __init__(self, receive: Callable, send: Callable, options: WebSocketOptions):
+        self._receive = receive
+        self._send = send
+        self._options = options
+
+        self._queue: asyncio.Queue = asyncio.Queue(options.send_queue_size)
+        self._writer: Optional[asyncio.Task] = None
+        self._pinger: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.received = 0
+        self.sent = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def accept(self, subprotocol: str = None):
+        message = await self._receive()
+        if message['type'] != 'websocket.connect':
+            raise WebSocketDisconnect(message.get('code', 1006))
+
+        await self._send({'type': 'websocket.accept', 'subprotocol': subprotocol})
+        self._writer = asyncio.ensure_future(self._write())
+        if self._options.ping_interval:
+            self._pinger = asyncio.ensure_future(self._ping())
+
+    async def receive(self) -> Message:
+        if self._closed:
+            raise WebSocketDisconnect(1006)
+
+        try:
+            message = await asyncio.wait_for(self._receive(), self._options.idle_timeout)
+        except asyncio.TimeoutError:
+            await self.close(1001)
+            raise WebSocketDisconnect(1001, 'Idle timeout')
+
+        if message['type'] == 'websocket.disconnect':
+            self._shutdown()
+            raise WebSocketDisconnect(message.get('code', 1000))
+
+        self.received += 1
+        text = message.get('text')
+        return text if text is not None else message.get('bytes', b'')
+
+    async def receive_json(self) -> Any:
+        return json.loads(await self.receive())
+
+    async def iter_messages(self) -> AsyncIterator[Message]:
+        try:
+            while True:
+                yield await self.receive()
+        except WebSocketDisconnect:
+            return
+
+    async def send(self, message: Message):
+        if self._closed:
+            raise WebSocketDisconnect(1006)
+
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            await self.close(1008)
+            raise WebSocketDisconnect(1008, 'Send queue overflow')
+
+    async def send_json(self, data: Any):
+        await self.send(json.dumps(data, cls=PydanticEncoder))
+
+    async def close(self, code: int = 1000):
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._pinger is not None:
+            self._pinger.cancel()
+        if self._writer is not None:
+            if self._queue.full():
+                self._writer.cancel()
+            else:
+                self._queue.put_nowait(None)
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+        try:
+            await self._send({'type': 'websocket.close', 'code': code})
+        except (OSError, RuntimeError):
+            pass
+
+    def _shutdown(self):
+        self._closed = True
+        for task in (self._writer, self._pinger):
+            if task is not None:
+                task.cancel()
+
+    async def _write(self):
+        while (message := await self._queue.get()) is not None:
+            key = 'text' if isinstance(message, str) else 'bytes'
+            try:
+                await self._send({'type': 'websocket.send', key: message})
+            except (OSError, RuntimeError):
+                self._closed = True
+                if self._pinger is not None:
+                    self._pinger.cancel()
+                return
+            self.sent += 1
+
+    async def _ping(self):
+        while True:
+            await asyncio.sleep(self._options.ping_interval)
+            if self._queue.empty():
+                self._queue.put_nowait(self._options.ping_message)
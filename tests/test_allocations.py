@@ -0,0 +1,94 @@
+import asyncio
+import tracemalloc
+import unittest
+
+from liteapi import App
+
+MAX_PEAK_PER_REQUEST = 16 * 1024
+MAX_RETAINED = 16 * 1024
+REQUESTS = 1000
+
+
+def build_app() -> App:
+    app = App()
+
+    @app.get('/items/{item_id}')
+    def get_item(item_id: int, q: str = ''):
+        return {'id': item_id, 'q': q}
+
+    return app
+
+
+def http_scope(path: str, query_string: bytes = b'') -> dict:
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'server': ('testserver', 80),
+        'client': ('testclient', 50000),
+        'scheme': 'http',
+        'method': 'GET',
+        'root_path': '',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver')],
+    }
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(message):
+    pass
+
+
+class RequestAllocationTest(unittest.TestCase):
+    def setUp(self):
+        self.app = build_app()
+        self.scope = http_scope('/items/7', b'q=abc')
+
+    def request(self):
+        return self.app(dict(self.scope), receive, send)
+
+    def test_peak_allocation_per_request(self):
+        async def measure():
+            for _ in range(100):
+                await self.request()
+
+            tracemalloc.start()
+            try:
+                peak = 0
+                for _ in range(REQUESTS):
+                    current = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    await self.request()
+                    peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+                return peak
+            finally:
+                tracemalloc.stop()
+
+        peak = asyncio.run(measure())
+        self.assertLess(peak, MAX_PEAK_PER_REQUEST)
+
+    def test_requests_do_not_retain_memory(self):
+        async def measure():
+            for _ in range(100):
+                await self.request()
+
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                for _ in range(REQUESTS):
+                    await self.request()
+                return tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+
+        retained = asyncio.run(measure())
+        self.assertLess(retained, MAX_RETAINED)
+
+
+if __name__ == '__main__':
+    unittest.main()